@@ -4,45 +4,129 @@ import argparse
 import os
 import re
 import queue
-from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 from datetime import datetime
 import glob
+import fnmatch
 from typing import Optional, Callable, List
 import random
+from sortedcontainers import SortedSet
+
+try:
+    import numpy as np # Optional; only used to shuffle very large proxy lists faster
+except ImportError:
+    np = None
 
 from checker.proxy_checker import ProxyChecker
 from helper.termination import termination_context, should_terminate
+from helper.log_writer import BufferedLogWriter
 
 SAVE_BATCH_SIZE = 25
+NUMPY_SHUFFLE_THRESHOLD = 50_000
+# Checker workers only run pycurl and a little parsing, so the default 8 MB stack
+# per thread is mostly wasted address space across hundreds of workers
+CHECKER_THREAD_STACK_SIZE = 512 * 1024
+# Upper bound on checker workers per usable CPU; beyond this, threads mostly add scheduling overhead
+THREADS_PER_CPU = 64
+# Seconds the eager worker start-up waits for all checker threads before giving up on the rest
+WORKER_START_TIMEOUT = 30
+_GLOB_MAGIC = re.compile(r'[*?[]')
 
-def _save_working_proxies(proxy_data, prepend_protocol, output_base, is_final=False) -> None:
-    """Saves the working proxies, creating the output directory if needed."""
+def _working_proxy_filename(output_base, protocol) -> str:
+    """Returns the per-protocol output filename, creating the output directory if needed."""
     base, ext = os.path.splitext(output_base)
     if not ext: ext = ".txt"
     directory = os.path.dirname(base)
     if directory and not os.path.exists(directory): os.makedirs(directory)
+    return f"{base}-{protocol}{ext}"
+
+def _format_working_proxy(proxy, protocol, prepend_protocol) -> str:
+    if prepend_protocol and protocol != 'all':
+        return f"{protocol}://{proxy}\n"
+    return f"{proxy}\n"
+
+def _append_working_proxy(handles, output_base, line, protocols, prepend_protocol) -> None:
+    """
+    Appends a single working proxy to the 'all' file and to each of its protocol files.
+    Files are opened lazily on first use and kept open in `handles`.
+    """
+    for protocol in ['all', *protocols]:
+        f = handles.get(protocol)
+        if f is None:
+            filename = _working_proxy_filename(output_base, protocol)
+            try:
+                f = open(filename, 'w', buffering=1 << 16, encoding='utf-8')
+            except IOError as e:
+                print(f"[ERROR] Could not write to output file '{filename}': {e}", flush=True)
+                continue
+            handles[protocol] = f
+        f.write(_format_working_proxy(line, protocol, prepend_protocol))
+
+def _flush_working_handles(handles, close=False) -> None:
+    for f in list(handles.values()):
+        try:
+            f.flush()
+            if close: f.close()
+        except (IOError, ValueError, RuntimeError): pass
+    if close: handles.clear()
 
+def _save_working_proxies(proxy_data, prepend_protocol, output_base) -> None:
+    """Rewrites the working proxy files from their SortedSets, creating the output directory if needed."""
     for protocol, proxies_set in proxy_data.items():
         if not proxies_set: continue
-        filename = f"{base}-{protocol}{ext}"
+        filename = _working_proxy_filename(output_base, protocol)
         try:
             with open(filename, 'w', encoding='utf-8') as f:
-                for proxy in sorted(proxies_set):
-                    if prepend_protocol and protocol != 'all':
-                        f.write(f"{protocol}://{proxy}\n")
-                    else:
-                        f.write(f"{proxy}\n")
+                for proxy in proxies_set:
+                    f.write(_format_working_proxy(proxy, protocol, prepend_protocol))
         except IOError as e:
             print(f"[ERROR] Could not write to output file '{filename}': {e}", flush=True)
-    if not is_final:
-        total = len(proxy_data.get('all', set()))
-        print(f"[PROGRESS] Interim save complete. {total} total working proxies.", flush=True)
 
 def check_and_format_proxy(checker, proxy_line):
     details = checker.check_proxy(proxy_line)
     if details: return (proxy_line, details)
     return None
 
+def shuffle_proxies(proxy_list: list, numpy_threshold: int = NUMPY_SHUFFLE_THRESHOLD) -> list:
+    """
+    Returns the proxies in random order. Lists longer than numpy_threshold are
+    permuted with numpy when it is installed, which is much faster than random.shuffle.
+    """
+    if np is not None and len(proxy_list) > numpy_threshold:
+        order = np.random.default_rng().permutation(len(proxy_list))
+        return [proxy_list[i] for i in order.tolist()]
+    random.shuffle(proxy_list)
+    return proxy_list
+
+def _start_all_workers(executor: ThreadPoolExecutor, count: int):
+    """
+    Starts `count` worker threads now instead of on demand; each start-up task holds its thread until all are running.
+    If a thread cannot be started, the ones already waiting are released and the checker runs with those.
+    """
+    if count < 1: return
+    barrier = threading.Barrier(count, timeout=WORKER_START_TIMEOUT)
+    futures = []
+    try:
+        for _ in range(count): futures.append(executor.submit(barrier.wait))
+    except RuntimeError as e:
+        barrier.abort()
+        print(f"[WARN] Started only {len(futures)} of {count} checker threads: {e}", flush=True)
+    for future in futures:
+        try: future.result()
+        except threading.BrokenBarrierError: pass
+
+def get_effective_threads(requested: int) -> int:
+    """Caps the requested worker count to what the CPUs available to this process can service."""
+    if hasattr(os, 'sched_getaffinity'): cpu_count = len(os.sched_getaffinity(0))
+    else: cpu_count = os.cpu_count() or 1
+    max_threads = cpu_count * THREADS_PER_CPU
+    if requested > max_threads:
+        print(f"[INFO] Capping checker threads from {requested} to {max_threads} ({cpu_count} CPUs available).", flush=True)
+        return max_threads
+    return requested
+
 def parse_timeout(timeout_str: str) -> float:
     timeout_str = timeout_str.strip().lower()
     try:
@@ -52,13 +136,35 @@ def parse_timeout(timeout_str: str) -> float:
     except (ValueError, TypeError):
         raise ValueError("Invalid timeout format")
 
+def _iter_pattern_files(pattern: str):
+    """
+    Yields the paths matching a file pattern. Patterns with a plain directory part are
+    matched with a single os.scandir pass; wildcard directories fall back to glob.
+    """
+    directory, name_pattern = os.path.split(pattern)
+    if _GLOB_MAGIC.search(directory):
+        yield from glob.glob(pattern)
+        return
+    if not _GLOB_MAGIC.search(name_pattern):
+        if os.path.lexists(pattern): yield pattern
+        return
+    try:
+        with os.scandir(directory or '.') as entries:
+            for entry in entries:
+                # Like glob, hidden files only match patterns that start with a dot
+                if entry.name.startswith('.') and not name_pattern.startswith('.'): continue
+                if fnmatch.fnmatch(entry.name, name_pattern):
+                    yield os.path.join(directory, entry.name) if directory else entry.name
+    except OSError:
+        return
+
 def load_proxies_from_patterns(patterns: list) -> list:
     """
     Finds all files matching the given patterns, loads all proxies,
     and returns a de-duplicated list.
     """
     all_files = set()
-    for pattern in patterns: all_files.update(glob.glob(pattern))
+    for pattern in patterns: all_files.update(_iter_pattern_files(pattern))
     if not all_files:
         print("[ERROR] No files found matching patterns.", flush=True)
         return []
@@ -66,21 +172,25 @@ def load_proxies_from_patterns(patterns: list) -> list:
     unique_proxies = set()
     for filepath in all_files:
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    p = line.strip()
-                    if p and not p.startswith('#'): unique_proxies.add(p)
-        except IOError: pass
+            # Read and split in bulk so the per-line work stays in C
+            with open(filepath, 'rb') as f:
+                data = f.read()
+        except IOError: continue
+        # Decode before filtering, so a line of undecodable bytes can't slip through as an empty proxy
+        lines = (line.decode('utf-8', 'ignore').strip() for line in data.split(b'\n'))
+        unique_proxies.update(p for p in lines if p and not p.startswith('#'))
     
     print(f"[INFO] Loaded {len(unique_proxies)} unique proxies from files.", flush=True)
     
     # Shuffle the proxies to avoid hitting large blocks of dead subnets (Tail of Death)
     # which causes the checker to seemingly stall or slow down significantly.
-    proxy_list = list(unique_proxies)
-    random.shuffle(proxy_list)
-    return proxy_list
+    return shuffle_proxies(list(unique_proxies))
 
 def run_checker_pipeline(args, input_queue: Optional[queue.Queue] = None, result_callback: Optional[Callable[[str, bool, dict], None]] = None):
+    """
+    Checks proxies loaded from args.input, or streamed through input_queue.
+    In pipeline mode the queue carries lists of proxies, and None as the end-of-input sentinel.
+    """
     try:
         timeout = parse_timeout(args.timeout)
         if timeout <= 0: timeout = 1.0
@@ -104,100 +214,159 @@ def run_checker_pipeline(args, input_queue: Optional[queue.Queue] = None, result
     if args.output: output_base_name = args.output
     else: output_base_name = f"working-proxies-{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
 
-    in_flight = {}
+    # Futures still being checked; each carries its proxy as `future.proxy`
+    in_flight = set()
     submitted_proxies = set()
-    working_proxies = {'all': set(), 'http': set(), 'socks4': set(), 'socks5': set()}
-    executor = ThreadPoolExecutor(max_workers=args.threads)
+    # Whatever this iterator has not yielded yet is exactly what was never submitted
+    pending_iter = iter(initial_proxies)
+    # SortedSets keep each bucket ordered on insert, so the final save needs no sort
+    working_proxies = {'all': SortedSet(), 'http': SortedSet(), 'socks4': SortedSet(), 'socks5': SortedSet()}
+    # Interim results are appended as they arrive; the sorted rewrite happens once at the end
+    output_handles = {}
+    threads = get_effective_threads(args.threads)
+    executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='Checker')
+    # The stack size is process-wide, so it only stays lowered while this executor's own workers start;
+    # scraper threads spawned meanwhile by ProxyGather's run mode keep the default
+    try: previous_stack_size = threading.stack_size(CHECKER_THREAD_STACK_SIZE)
+    except (ValueError, RuntimeError): previous_stack_size = None
+    # A file run never has more probes in flight than it has proxies
+    try: _start_all_workers(executor, threads if input_queue else min(threads, len(initial_proxies)))
+    finally:
+        if previous_stack_size is not None: threading.stack_size(previous_stack_size)
 
     def shutdown_executor():
+        # Abort in-flight probes first, so workers don't sit out their full timeout
+        checker.close()
         try: executor.shutdown(wait=False, cancel_futures=True)
         except: pass
 
     def save_resume_file():
         # Only simple resume for file-based mode
         if input_queue: return
-        remaining = set(initial_proxies) - submitted_proxies
-        remaining.update(in_flight.values())
+        remaining = set(pending_iter)
+        remaining.update(future.proxy for future in list(in_flight))
         if not remaining: return
         
         timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
         fname = f"proxies-to-resume-{timestamp}.txt"
         try:
             with open(fname, 'w', encoding='utf-8') as f:
-                for p in sorted(list(remaining)): f.write(p + '\n')
+                f.write('\n'.join(sorted(remaining)) + '\n')
             print(f"[SUCCESS] Resume file saved: {fname}", flush=True)
         except Exception as e:
             print(f"[ERROR] Failed to save resume file: {e}", flush=True)
 
-    with termination_context(callbacks=[shutdown_executor]):
+    def flush_output():
+        _flush_working_handles(output_handles)
+
+    # Per-result console output is written by a background thread instead of flushing on every hit
+    result_log = BufferedLogWriter().start()
+
+    with termination_context(callbacks=[shutdown_executor, flush_output]):
         try:
             print(f"[INFO] Public IP: {checker.ip}", flush=True)
-            print(f"--- Checking with {args.threads} workers, {timeout}s timeout ---", flush=True)
+            print(f"--- Checking with {threads} workers, {timeout}s timeout ---", flush=True)
 
-            pending_list = list(initial_proxies)
-            pending_index = 0
+            pending_done = False
+            pending_from_pipeline = deque()
             pipeline_mode = (input_queue is not None)
+            # Single event stream for the loop to block on: ('done', future) from finished
+            # workers and ('input', batch) from the scraper queue, with a None batch as the sentinel
+            events = queue.Queue()
+
+            def on_future_done(future):
+                events.put(('done', future))
+
+            # Set by the loop whenever it is running low on proxies. The pump only pulls a batch when asked,
+            # so a bounded input_queue keeps applying back-pressure to the scrapers.
+            input_wanted = threading.Event()
+
+            def pump_input():
+                while True:
+                    input_wanted.wait()
+                    input_wanted.clear()
+                    batch = input_queue.get()
+                    events.put(('input', batch))
+                    if batch is None: return
+
+            if pipeline_mode:
+                threading.Thread(target=pump_input, name="CheckerInputPump", daemon=True).start()
             
             while True:
                 if should_terminate(): break
 
-                while len(in_flight) < args.threads * 2:
+                while len(in_flight) < threads * 2:
                     proxy_to_check = None
-                    
-                    if input_queue:
-                        try:
-                            proxy_to_check = input_queue.get_nowait()
-                            if proxy_to_check is None: # Sentinel
-                                pipeline_mode = False
-                                break
-                        except queue.Empty: pass
-                    
-                    if not proxy_to_check and pending_index < len(pending_list):
-                        proxy_to_check = pending_list[pending_index]
-                        pending_index += 1
+                    if pending_from_pipeline:
+                        proxy_to_check = pending_from_pipeline.popleft()
+                    elif not pending_done:
+                        proxy_to_check = next(pending_iter, None)
+                        pending_done = proxy_to_check is None
                     
                     if proxy_to_check:
-                        if proxy_to_check not in submitted_proxies:
+                        # A single set.add both records the proxy and tells us whether it was new
+                        submitted_before = len(submitted_proxies)
+                        submitted_proxies.add(proxy_to_check)
+                        if len(submitted_proxies) > submitted_before:
                             future = executor.submit(check_and_format_proxy, checker, proxy_to_check)
-                            in_flight[future] = proxy_to_check
-                            submitted_proxies.add(proxy_to_check)
+                            future.proxy = proxy_to_check
+                            in_flight.add(future)
+                            future.add_done_callback(on_future_done)
                     else:
                         break
                 
-                if in_flight:
-                    done_futures, _ = wait(in_flight.keys(), timeout=0.1, return_when=FIRST_COMPLETED)
-                    for future in done_futures:
-                        proxy = in_flight.pop(future)
-                        try:
-                            result = future.result()
-                            if result:
-                                line, details = result
-                                working_proxies['all'].add(line)
-                                for p in details.get('protocols', []):
-                                    if p in working_proxies: working_proxies[p].add(line)
-
-                                print(f"\n[SUCCESS] Proxy: {line:<21} | Anon: {details['anonymity']:<11} | {','.join(details['protocols']):<14} | {details['timeout']}ms", flush=True)
-                                if len(working_proxies['all']) % SAVE_BATCH_SIZE == 0:
-                                    _save_working_proxies(working_proxies, args.prepend_protocol, output_base_name)
-
-                                if result_callback: result_callback(proxy, True, details)
-                            else:
-                                if args.verbose: print(".", end="", flush=True)
-                                if result_callback: result_callback(proxy, False, {})
-                        except Exception as exc:
-                            if args.verbose: print(f"\n[ERROR] Exception checking {proxy}: {exc}", flush=True)
-                            if result_callback: result_callback(proxy, False, {})
-                
-                if not in_flight and not pipeline_mode and pending_index >= len(pending_list):
+                if not in_flight and not pipeline_mode and not pending_from_pipeline and pending_done:
                     break
-                
-                if not in_flight:
-                    import time
-                    time.sleep(0.5)
+                if pipeline_mode and len(pending_from_pipeline) < threads * 2:
+                    input_wanted.set()
+
+                try:
+                    batch_events = [events.get(timeout=1.0)]
+                except queue.Empty:
+                    continue
+                while True:
+                    try: batch_events.append(events.get_nowait())
+                    except queue.Empty: break
+
+                done_futures = []
+                for kind, payload in batch_events:
+                    if kind == 'done': done_futures.append(payload)
+                    elif payload is None: pipeline_mode = False
+                    else: pending_from_pipeline.extend(payload)
+
+                for future in done_futures:
+                    in_flight.discard(future)
+                    proxy = future.proxy
+                    try:
+                        result = future.result()
+                        if result:
+                            line, details = result
+                            protocols = details.get('protocols', [])
+                            working_proxies['all'].add(line)
+                            for p in protocols:
+                                if p in working_proxies: working_proxies[p].add(line)
+
+                            anonymity, latency, protocol_list = details['anonymity'], details['timeout'], ','.join(protocols)
+                            result_log.write(f"\n[SUCCESS] Proxy: {line:<21} | Anon: {anonymity:<11} | {protocol_list:<14} | {latency}ms\n")
+                            _append_working_proxy(output_handles, output_base_name, line, protocols, args.prepend_protocol)
+                            if len(working_proxies['all']) % SAVE_BATCH_SIZE == 0:
+                                _flush_working_handles(output_handles)
+                                result_log.write(f"[PROGRESS] Interim save complete. {len(working_proxies['all'])} total working proxies.\n")
+
+                            if result_callback: result_callback(proxy, True, details)
+                        else:
+                            if args.verbose: result_log.write(".")
+                            if result_callback: result_callback(proxy, False, {})
+                    except Exception as exc:
+                        if args.verbose: result_log.write(f"\n[ERROR] Exception checking {proxy}: {exc}\n")
+                        if result_callback: result_callback(proxy, False, {})
 
         except Exception as e:
             print(f"[ERROR] Checker loop error: {e}", flush=True)
             return
+        finally:
+            result_log.close()
+            _flush_working_handles(output_handles, close=True)
 
         if should_terminate():
             print("[INTERRUPTED] Stopping...", flush=True)
@@ -207,7 +376,7 @@ def run_checker_pipeline(args, input_queue: Optional[queue.Queue] = None, result
         total = len(working_proxies['all'])
         print(f"Found {total} working proxies.", flush=True)
         if total > 0:
-            _save_working_proxies(working_proxies, args.prepend_protocol, output_base_name, is_final=True)
+            _save_working_proxies(working_proxies, args.prepend_protocol, output_base_name)
 
 def main():
     parser = argparse.ArgumentParser(description="Proxy checker.")
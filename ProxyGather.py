@@ -4,32 +4,43 @@ import queue
 import threading
 from datetime import datetime
 from collections import defaultdict
-from typing import Set, Dict
+from functools import lru_cache
+from typing import Set, Dict, List, Tuple
 from urllib.parse import urlparse
 import re
-import random
 
 from ScrapeAllProxies import run_scraper_pipeline, list_available_scrapers, show_legal_disclaimer, DEFAULT_OUTPUT_FILE
-from CheckProxies import run_checker_pipeline
+from CheckProxies import run_checker_pipeline, shuffle_proxies
 from helper.termination import termination_context, should_terminate
 
+# Number of lock stripes guarding per-proxy state in run mode (must be a power of two)
+PROXY_LOCK_STRIPES = 64
+# Max scraped batches waiting for the checker in run mode; scrapers block when it is full
+PROXY_QUEUE_MAX_BATCHES = 256
+
+# Scrapers whose source is identified by the reported URL rather than by the scraper name
+_URL_SOURCE_SCRAPERS = frozenset({'Websites', 'Discover'})
+_GH_PATTERN = re.compile(r'https?://(?:www\.)?(?:cdn\.jsdelivr\.net/gh|fastly\.jsdelivr\.net/gh|raw\.githubusercontent\.com|github\.com)/([^/]+)/([^/@#?]+)')
+
+def _netloc(url: str) -> str:
+    """Returns the URL's netloc without a leading 'www.'."""
+    return urlparse(url).netloc.removeprefix("www.")
+
+@lru_cache(maxsize=8192)
 def get_source_identifier(url: str, scraper_name: str) -> str:
-    """Returns a clean source identifier from URL or scraper name."""
-    if scraper_name not in ['Websites', 'Discover']:
+    """Returns a clean source identifier from URL or scraper name. Memoized, since scrapers report the same URL many times."""
+    if scraper_name not in _URL_SOURCE_SCRAPERS:
         return scraper_name
     
     if not url or url == "N/A": return scraper_name
 
-    gh_pattern = re.compile(r'https?://(?:www\.)?(?:cdn\.jsdelivr\.net/gh|fastly\.jsdelivr\.net/gh|raw\.githubusercontent\.com|github\.com)/([^/]+)/([^/@#?]+)')
-    match = gh_pattern.search(url)
+    match = _GH_PATTERN.search(url)
     if match:
         user, repo = match.groups()
         return f"github:{user}/{repo}"
     
     try:
-        netloc = urlparse(url).netloc
-        if netloc.startswith("www."): netloc = netloc[4:]
-        return netloc
+        return _netloc(url)
     except Exception:
         return scraper_name
 
@@ -69,18 +80,9 @@ def cmd_scrape(args):
         print(f"{'Source':<45} | {'Proxies':<10}")
         print("-" * 60)
         
-        # Calculate per-source counts
-        source_counts = {}
-        for source, proxies in results.items():
-            if source == 'Websites':
-                # For Websites scraper, we don't have per-URL breakdown in results
-                # so just use the total count
-                source_counts[source] = len(proxies) if proxies else 0
-            else:
-                source_counts[source] = len(proxies) if proxies else 0
-        
+        # Results already hold per-source counts; Websites has no per-URL breakdown, so it shows its total
         # Sort by count descending
-        sorted_stats = sorted(source_counts.items(), key=lambda x: x[1], reverse=True)
+        sorted_stats = sorted(results.items(), key=lambda x: x[1], reverse=True)
         for source, count in sorted_stats:
             display_source = source[:43] if len(source) > 43 else source
             print(f"{display_source:<45} | {count:<10}")
@@ -108,11 +110,21 @@ def cmd_run(args):
     # 2. Checker output: use --checker-output if provided, otherwise None for timestamped default
     args.output = args.checker_output  # CheckProxies uses args.output
     
-    proxy_queue = queue.Queue()
-    stats = defaultdict(lambda: {'scraped': 0, 'working': 0})
+    proxy_queue = queue.Queue(maxsize=PROXY_QUEUE_MAX_BATCHES)
+    # Set once the checker stops consuming, so blocked scrapers don't wait on it forever
+    checker_done = threading.Event()
+    backpressure_logged = threading.Event()
+    # Per-source [scraped, working] counters, each guarded by its own lock
+    stats: Dict[str, List[int]] = {}
+    source_locks: Dict[str, threading.Lock] = {}
+    # Per-proxy state is guarded by a striped lock chosen from the proxy's hash
     proxy_to_sources: Dict[str, Set[str]] = defaultdict(set)
     checked_cache: Dict[str, bool] = {}
-    stats_lock = threading.Lock()
+    proxy_locks = [threading.Lock() for _ in range(PROXY_LOCK_STRIPES)]
+
+    def get_source_stats(source_id) -> Tuple[List[int], threading.Lock]:
+        # setdefault is atomic, so concurrent callers always share the same row and lock
+        return stats.setdefault(source_id, [0, 0]), source_locks.setdefault(source_id, threading.Lock())
     
     # Load additional proxies from --checker-input files if provided
     additional_proxies_loaded = 0
@@ -120,37 +132,71 @@ def cmd_run(args):
         from CheckProxies import load_proxies_from_patterns
         additional_proxies = load_proxies_from_patterns(args.checker_input)
         for proxy in additional_proxies:
-            proxy_queue.put(proxy)
             # Track these proxies as coming from 'checker-input' source
             proxy_to_sources[proxy].add('checker-input')
             additional_proxies_loaded += 1
         if additional_proxies_loaded > 0:
-            stats['checker-input']['scraped'] = additional_proxies_loaded
+            proxy_queue.put(additional_proxies)
+            get_source_stats('checker-input')[0][0] = additional_proxies_loaded
             print(f"[INFO] Loaded {additional_proxies_loaded} additional proxies from checker-input files", flush=True)
 
+    def enqueue_for_checker(batch):
+        """Puts a batch on the bounded checker queue, blocking while the checker catches up."""
+        try:
+            proxy_queue.put_nowait(batch)
+            return
+        except queue.Full: pass
+        if not backpressure_logged.is_set():
+            backpressure_logged.set()
+            print("[INFO] Checker queue is full, scrapers will wait for the checker to catch up.", flush=True)
+        while not checker_done.is_set() and not should_terminate():
+            try:
+                proxy_queue.put(batch, timeout=0.5)
+                return
+            except queue.Full: continue
+
     def on_proxy_scraped(scraper_name, source_detail, proxies_found):
         source_id = get_source_identifier(source_detail, scraper_name)
         
         # Convert to list and shuffle to avoid feeding sorted chunks of dead proxies to checker
-        proxies_list = list(proxies_found)
-        random.shuffle(proxies_list)
+        proxies_list = shuffle_proxies(list(proxies_found), numpy_threshold=1024)
         
-        with stats_lock:
-            stats[source_id]['scraped'] += len(proxies_list)
-            for proxy in proxies_list:
-                proxy_to_sources[proxy].add(source_id)
-                if proxy in checked_cache and checked_cache[proxy]:
-                    stats[source_id]['working'] += 1
-                
-                if len(proxy_to_sources[proxy]) == 1:
-                    proxy_queue.put(proxy)
+        # Group by lock stripe so each stripe lock is taken once per batch
+        by_stripe = defaultdict(list)
+        for proxy in proxies_list:
+            by_stripe[hash(proxy) & (PROXY_LOCK_STRIPES - 1)].append(proxy)
+
+        # Collect unseen proxies and hand them to the checker as a single batch
+        new_proxies = []
+        already_working = 0
+        sources_of, is_working, add_new = proxy_to_sources, checked_cache.get, new_proxies.append
+        for stripe, stripe_proxies in by_stripe.items():
+            with proxy_locks[stripe]:
+                for proxy in stripe_proxies:
+                    sources = sources_of[proxy]
+                    # An empty set means no source has reported this proxy before
+                    if not sources: add_new(proxy)
+                    sources.add(source_id)
+                    if is_working(proxy): already_working += 1
+
+        row, row_lock = get_source_stats(source_id)
+        with row_lock:
+            row[0] += len(proxies_list)
+            row[1] += already_working
+
+        if new_proxies:
+            enqueue_for_checker(new_proxies)
 
     def on_proxy_checked(proxy, is_working, details):
-        with stats_lock:
+        with proxy_locks[hash(proxy) & (PROXY_LOCK_STRIPES - 1)]:
             checked_cache[proxy] = is_working
-            if is_working:
-                for source_id in proxy_to_sources.get(proxy, []):
-                    stats[source_id]['working'] += 1
+            if not is_working: return
+            sources = tuple(proxy_to_sources.get(proxy, ()))
+
+        for source_id in sources:
+            row, row_lock = get_source_stats(source_id)
+            with row_lock:
+                row[1] += 1
 
     class ScraperArgsWrapper:
         def __init__(self, original_args, output_file):
@@ -166,13 +212,16 @@ def cmd_run(args):
         run_scraper_pipeline(s_args, proxy_found_callback=on_proxy_scraped, handle_signals=False, skip_disclaimer=True)
         # Put sentinel value to signal scraper is done
         # If we loaded additional proxies, we need to account for that
-        proxy_queue.put(None)
+        enqueue_for_checker(None)
 
     with termination_context():
         scraper_thread = threading.Thread(target=scraper_worker, name="ScraperOrchestrator")
         scraper_thread.start()
 
-        run_checker_pipeline(args, input_queue=proxy_queue, result_callback=on_proxy_checked)
+        try:
+            run_checker_pipeline(args, input_queue=proxy_queue, result_callback=on_proxy_checked)
+        finally:
+            checker_done.set()
         
         scraper_thread.join()
 
@@ -180,9 +229,9 @@ def cmd_run(args):
     print(f"{'Source':<40} | {'Scraped':<10} | {'Working':<10}")
     print("-" * 60)
     
-    sorted_stats = sorted(stats.items(), key=lambda x: x[1]['working'], reverse=True)
-    for source, data in sorted_stats:
-        print(f"{source[:38]:<40} | {data['scraped']:<10} | {data['working']:<10}")
+    sorted_stats = sorted(stats.items(), key=lambda x: x[1][1], reverse=True)
+    for source, (scraped, working) in sorted_stats:
+        print(f"{source[:38]:<40} | {scraped:<10} | {working:<10}")
     
     unique_scraped = len(proxy_to_sources)
     unique_working = sum(1 for proxy, is_working in checked_cache.items() if is_working)
@@ -1,18 +1,28 @@
-﻿import os
-import sys
+﻿import atexit
 import json
+import os
+import sys
+import time
 import argparse
 import re
 import shutil
 import subprocess
 import tempfile
-from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
-from typing import List, Dict, Union, Tuple, Set, Optional, Callable
-from urllib.parse import urlparse
-from seleniumbase import SB
-from contextlib import contextmanager
-
-from scrapers.proxy_scraper import scrape_proxies
+import multiprocessing
+import multiprocessing.util
+import signal
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, as_completed, wait
+from typing import List, Dict, Union, Tuple, Set, Optional, Callable, Iterable
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache, partial
+import seleniumbase.drivers as seleniumbase_drivers
+
+try:
+    from pyvirtualdisplay import Display # Optional; runs Xvfb in-process for headful scrapers on headless Linux
+except ImportError:
+    Display = None
+
+from scrapers.proxy_scraper import scrape_proxies, proxy_sort_key
 from scrapers.proxyscrape_api_fetcher import fetch_from_api
 from scrapers.proxydb_scraper import scrape_all_from_proxydb
 from scrapers.geonode_scraper import scrape_from_geonode_api
@@ -32,13 +42,33 @@ from automation_scrapers.openproxylist_scraper import scrape_from_openproxylist
 from automation_scrapers.hidemn_scraper import scrape_from_hidemn
 from scrapers.source_discoverer import discover_urls_from_file, convert_to_jsdelivr_url
 from helper.termination import termination_context, should_terminate, get_termination_handler
+from helper.json_utils import json_loads, JSONDecodeError
+from helper.log_writer import get_log_writer
+from helper.browser_pool import acquire_browser, warm_browser, discard_browser, close_all_browsers, sweep_stale_profiles
 
 SITES_FILE = 'sites-to-get-proxies-from.txt'
 SOURCES_FILE = 'sites-to-get-sources-from.txt'
 DEFAULT_OUTPUT_FILE = 'scraped-proxies.txt'
+# Lower bound for the regular scraper pool when only a handful of scrapers are selected
+MIN_SCRAPER_WORKERS = 4
+# Running average of each regular scraper's duration, used to start the slowest ones first
+TASK_STATS_FILE = os.path.join(os.path.expanduser('~'), '.proxygather', 'task_stats.json')
+# Assumed duration in seconds for scrapers with no recorded runs, so new ones are scheduled early
+DEFAULT_TASK_DURATION = 60.0
+# Weight of the latest run in the duration average
+TASK_STATS_ALPHA = 0.3
+# Signal handlers cannot interrupt a blocking wait on Windows, so wake periodically there to let Ctrl+C run
+COMPLETION_WAKEUP_INTERVAL = 1.0 if sys.platform == 'win32' else None
 __all__ = ['DEFAULT_OUTPUT_FILE', 'run_scraper_pipeline', 'list_available_scrapers', 'show_legal_disclaimer']
-INVALID_IP_REGEX = re.compile(
-    r"^(10\.|127\.|192\.168\.|172\.(1[6-9]|2[0-9]|3[01])\.|169\.254\.|0\.|2(2[4-9]|3[0-9])\.|2(4[0-9]|5[0-5])\.)"
+# Captures the host of a URL without its leading "www.", port or path; cheaper than a full urlparse
+NETLOC_RE = re.compile(r'^[a-z][a-z0-9+.-]*://(?:www\.)?([^/:?#]+)', re.IGNORECASE)
+# Matches every line that does not start with a private, loopback, link-local or multicast/reserved prefix.
+# Run with findall over each scraper's proxies joined by newlines, so the filter is a single C-level scan per batch.
+# The lookahead is factored by leading digit so each line is decided from its first octet
+# (plus the second for 172/192/169) without retrying a flat list of alternatives.
+VALID_PROXY_LINE_REGEX = re.compile(
+    r"^(?!(?:0|1(?:0|27|92\.168|72\.(?:1[6-9]|2[0-9]|3[01])|69\.254)|2(?:2[4-9]|[34][0-9]|5[0-5]))\.).+$",
+    re.MULTILINE
 )
 
 # Define scrapers globally so they can be accessed by list_available_scrapers
@@ -72,67 +102,155 @@ def save_proxies_to_file(proxies: list, filename: str):
         if directory and not os.path.exists(directory):
             print(f"[INFO] Creating output directory: {directory}", flush=True)
             os.makedirs(directory)
+        # One joined write instead of a write call per proxy
         with open(filename, 'w', encoding='utf-8') as f:
-            for proxy in proxies:
-                f.write(proxy + '\n')
+            if proxies: f.write('\n'.join(proxies) + '\n')
         print(f"[SUCCESS] Successfully saved {len(proxies)} unique proxies to '{filename}'", flush=True)
     except IOError as e:
         print(f"[ERROR] Could not write to file '{filename}': {e}", flush=True)
 
+def load_task_stats() -> Dict[str, float]:
+    try:
+        with open(TASK_STATS_FILE, 'rb') as f:
+            stats = json_loads(f.read())
+    except (OSError, JSONDecodeError):
+        return {}
+    if not isinstance(stats, dict): return {}
+    # Drop hand-edited or corrupt entries; those tasks fall back to DEFAULT_TASK_DURATION
+    return {name: float(value) for name, value in stats.items() if isinstance(value, (int, float)) and not isinstance(value, bool)}
+
+def save_task_stats(stats: Dict[str, float]):
+    tmp_path = TASK_STATS_FILE + '.tmp'
+    try:
+        os.makedirs(os.path.dirname(TASK_STATS_FILE), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(stats, f)
+        os.replace(tmp_path, TASK_STATS_FILE)
+    except OSError as e:
+        print(f"[WARN] Could not save scraper timings to '{TASK_STATS_FILE}': {e}", flush=True)
+
 def parse_sites_file(filename: str) -> List[Tuple[str, Union[Dict, None], Union[Dict, None]]]:
     scrape_targets = []
-    if not os.path.exists(filename):
+    append = scrape_targets.append
+    # Read once and filter with C-level string ops; only lines carrying payload/headers need JSON parsing
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            lines = [line for line in map(str.strip, f.read().splitlines()) if line and line[0] != '#']
+    except FileNotFoundError:
         return []
-    with open(filename, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith('#'): continue
-            parts = line.split('|', 2)
-            url = parts[0].strip()
-            payload = None
-            headers = None
-            if len(parts) > 1 and parts[1].strip():
-                try: payload = json.loads(parts[1].strip())
-                except json.JSONDecodeError: print(f"[WARN] Invalid JSON in payload for URL: {url}. Skipping.", flush=True)
-            if len(parts) > 2 and parts[2].strip():
-                try: headers = json.loads(parts[2].strip())
-                except json.JSONDecodeError: print(f"[WARN] Invalid JSON in headers for URL: {url}. Skipping.", flush=True)
-            scrape_targets.append((url, payload, headers))
+    for line in lines:
+        if '|' not in line:
+            append((line, None, None))
+            continue
+        parts = line.split('|', 2)
+        url = parts[0].strip()
+        payload = None
+        headers = None
+        if len(parts) > 1 and parts[1].strip():
+            try: payload = json_loads(parts[1])
+            except JSONDecodeError: print(f"[WARN] Invalid JSON in payload for URL: {url}. Skipping.", flush=True)
+        if len(parts) > 2 and parts[2].strip():
+            try: headers = json_loads(parts[2])
+            except JSONDecodeError: print(f"[WARN] Invalid JSON in headers for URL: {url}. Skipping.", flush=True)
+        append((url, payload, headers))
     return scrape_targets
 
+# Sources files list many URLs per host and the same sites recur across runs, so these lookups are memoised
+@lru_cache(maxsize=8192)
+def source_dedup_key(url: str) -> str:
+    """
+    Returns the jsDelivr form of a URL with its scheme and host lower-cased, so
+    HTTP://Example.com/a and http://example.com/a compare equal. The path keeps
+    its case since it is significant on most hosts (GitHub included).
+    """
+    m = NETLOC_RE.match(url)
+    if m: url = url[:m.end()].lower() + url[m.end():]
+    return convert_to_jsdelivr_url(url)
+
+@lru_cache(maxsize=8192)
+def url_host(url: str) -> str:
+    """Returns the lower-cased host of a URL without a leading "www.", or '' if it has none."""
+    m = NETLOC_RE.match(url)
+    return m.group(1).lower() if m else ''
+
 def run_automation_task(scraper_name: str, scraper_func, verbose_flag: bool, is_headful: bool, turnstile_delay: float = 0):
     """
-    A wrapper to run a single automation scraper in its own browser instance,
-    with a dedicated, temporary user profile to ensure isolation.
+    A wrapper to run a single automation scraper on its worker process's pooled browser.
+    The browser keeps its own temporary profile and is reset between tasks; it is
+    discarded if the scraper fails so the next task gets a fresh instance.
     """
-    temp_dir = tempfile.mkdtemp()
-    try:
-        with SB(uc=True, headed=is_headful, headless2=(not is_headful), disable_csp=True, user_data_dir=temp_dir) as sb:
+    slot = _automation_slots.get(is_headful)
+    with slot if slot is not None else nullcontext():
+        try:
+            sb = acquire_browser(is_headful)
             return scraper_func(sb, verbose=verbose_flag, turnstile_delay=turnstile_delay)
-    except Exception as e:
-        print(f"[ERROR] {scraper_name} scraper failed: {e}", flush=True)
-        return []
-    finally:
-        shutil.rmtree(temp_dir, ignore_errors=True)
+        except Exception as e:
+            print(f"[ERROR] {scraper_name} scraper failed: {e}", flush=True)
+            discard_browser(is_headful)
+            return []
+
+# Per-mode concurrency limits, shared by every worker of the automation pool (keyed by is_headful)
+_automation_slots: Dict[bool, object] = {}
+
+def _init_automation_worker(headless_slots, headful_slot):
+    """
+    Runs once in each automation worker process. Ctrl+C reaches the whole process
+    group, but termination is coordinated by the parent, so workers ignore it just
+    as worker threads would. Worker processes exit without running atexit hooks,
+    so pooled browsers and the queued log output are handled through
+    multiprocessing's exit finalizers instead.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _automation_slots[False] = headless_slots
+    _automation_slots[True] = headful_slot
+    multiprocessing.util.Finalize(None, close_all_browsers, exitpriority=10)
+    # Lower priority runs later, so messages logged while browsers close are still written
+    multiprocessing.util.Finalize(None, get_log_writer().close, exitpriority=5)
+
+def _automation_executor(headless_workers: int, headful_workers: int) -> ProcessPoolExecutor:
+    """
+    One process pool for both browser modes. Headless scrapers share a semaphore of
+    `headless_workers` slots and headful scrapers a single lock, so headful runs stay
+    sequential while either mode can use workers the other leaves idle.
+    """
+    # Each browser gets its own interpreter, so a crashing driver cannot take sibling scrapers down with it
+    ctx = multiprocessing.get_context('spawn')
+    return ProcessPoolExecutor(
+        max_workers=headless_workers + headful_workers,
+        mp_context=ctx,
+        initializer=_init_automation_worker,
+        initargs=(ctx.Semaphore(max(headless_workers, 1)), ctx.Lock()),
+    )
+
+def uc_driver_cached() -> bool:
+    """
+    Returns True if SeleniumBase already holds a UC driver in its persistent drivers
+    folder, in which case the serialized pre-flight download can be skipped.
+    """
+    uc_driver_filename = "uc_driver.exe" if sys.platform == "win32" else "uc_driver"
+    drivers_folder_path = os.path.dirname(os.path.realpath(seleniumbase_drivers.__file__))
+    return os.path.exists(os.path.join(drivers_folder_path, uc_driver_filename))
 
-def pre_run_browser_setup():
+def pre_run_browser_setup(is_headful: bool = False):
     """
-    Initializes and closes a browser instance to trigger the driver download
-    and setup process once, before any concurrent tasks start.
+    Runs as the first task on the automation pool: triggers the driver download
+    once, before any concurrent tasks start, and leaves the launched browser in
+    the worker's pool so the first scraper it serves starts warm.
     """
     print("[INFO] Performing browser driver pre-flight check...", flush=True)
     try:
-        with SB(uc=True, headless2=True) as sb:
-            sb.open("about:blank")
-            driver_executable_path = sb.driver.service.path
-            drivers_folder_path = os.path.dirname(driver_executable_path)
-            uc_driver_filename = "uc_driver.exe" if sys.platform == "win32" else "uc_driver"
-            if os.path.exists(os.path.join(drivers_folder_path, uc_driver_filename)):
-                print("[SUCCESS] Browser driver is ready.", flush=True)
-            else:
-                print("[WARN] UC driver not found after initial check, but pre-flight check completed.", flush=True)
+        sb = warm_browser(is_headful)
+        sb.open("about:blank")
+        driver_executable_path = sb.driver.service.path
+        drivers_folder_path = os.path.dirname(driver_executable_path)
+        uc_driver_filename = "uc_driver.exe" if sys.platform == "win32" else "uc_driver"
+        if os.path.exists(os.path.join(drivers_folder_path, uc_driver_filename)):
+            print("[SUCCESS] Browser driver is ready.", flush=True)
+        else:
+            print("[WARN] UC driver not found after initial check, but pre-flight check completed.", flush=True)
     except Exception as e:
         print(f"[ERROR] A critical error occurred during browser pre-flight check: {e}", flush=True)
+        discard_browser(is_headful)
 
 def show_legal_disclaimer(auto_accept=False):
     print("\n" + "="*70)
@@ -150,9 +268,7 @@ def show_legal_disclaimer(auto_accept=False):
     print("  python ScrapeAllProxies.py --compliant")
     print("")
     if auto_accept:
-        import time
-        print("[INFO] Auto-accepting disclaimer (--yes flag provided). Proceeding in 2 seconds...", flush=True)
-        time.sleep(2)
+        print("[INFO] Auto-accepting disclaimer (--yes flag provided).", flush=True)
         print("\n[INFO] Proceeding in aggressive mode. You are responsible for legal compliance.\n", flush=True)
         return True
 
@@ -174,7 +290,7 @@ def list_available_scrapers(args):
     print(f"  Discover (URLs discovered from website lists from {SOURCES_FILE})", flush=True)
     
     # Sort for consistent output
-    sorted_names = sorted(list(ALL_SCRAPER_TASKS.keys()))
+    sorted_names = sorted(ALL_SCRAPER_TASKS)
     
     for name in sorted_names:
         if name in ['Websites', 'Discover']: continue
@@ -188,9 +304,21 @@ def list_available_scrapers(args):
         marker_str = f" ({', '.join(extra_info)})" if extra_info else ""
         print(f"  {name}{marker_str}", flush=True)
 
+def start_virtual_display() -> bool:
+    """Starts an Xvfb display in this process and points DISPLAY at it. Returns False if Xvfb could not start."""
+    try:
+        display = Display(visible=False, size=(1920, 1080), use_xauth=True)
+        display.start()
+    except Exception as e:
+        print(f"[WARN] Could not start a virtual display ({e}); falling back to xvfb-run.", flush=True)
+        return False
+    atexit.register(display.stop)
+    print("[INFO] Started a virtual display for headful scrapers.", flush=True)
+    return True
+
 def run_scraper_pipeline(
     args, 
-    proxy_found_callback: Optional[Callable[[str, str, List[str]], None]] = None,
+    proxy_found_callback: Optional[Callable[[str, str, Iterable[str]], None]] = None,
     handle_signals: bool = True,
     skip_disclaimer: bool = False
 ):
@@ -198,7 +326,7 @@ def run_scraper_pipeline(
     Main scraping logic.
     Args:
         args: Parsed arguments.
-        proxy_found_callback: fn(scraper_name, source_detail, proxies)
+        proxy_found_callback: fn(scraper_name, source_detail, proxies). Proxies may be any iterable of strings.
         handle_signals: If True, registers signal handlers for Ctrl+C. 
         skip_disclaimer: If True, skips the legal disclaimer (assumes caller handled it).
     """
@@ -222,18 +350,22 @@ def run_scraper_pipeline(
     general_scraper_name = 'Websites'
     discovery_scraper_name = 'Discover'
 
-    # Build the task map (reconstruct to allow closures like lambda verbose: ...)
+    # Websites and Discover fetch their URLs on one shared pool instead of a private pool each.
+    # Threads start on demand, so creating it when neither runs costs nothing.
+    url_executor = ThreadPoolExecutor(max_workers=args.threads, thread_name_prefix='UrlScraper')
+
+    # Build the task map (reconstruct to bind per-run options with partial)
     tasks_to_run = {}
     
     # 1. Standard scrapers
     for name, func in ALL_SCRAPER_TASKS.items():
         if name in ['Websites', 'Discover']: continue
         if name == 'ProxyDB':
-            tasks_to_run[name] = lambda verbose: scrape_all_from_proxydb(verbose=verbose, compliant_mode=args.compliant)
+            tasks_to_run[name] = partial(scrape_all_from_proxydb, compliant_mode=args.compliant)
         elif name == 'Proxy-Daily':
-            tasks_to_run[name] = lambda verbose: scrape_from_proxydaily(verbose=verbose, compliant_mode=args.compliant)
+            tasks_to_run[name] = partial(scrape_from_proxydaily, compliant_mode=args.compliant)
         elif name == 'Geonode':
-            tasks_to_run[name] = lambda verbose: scrape_from_geonode_api(verbose=verbose, compliant_mode=args.compliant)
+            tasks_to_run[name] = partial(scrape_from_geonode_api, compliant_mode=args.compliant)
         else:
             tasks_to_run[name] = func
 
@@ -243,9 +375,10 @@ def run_scraper_pipeline(
     if scrape_targets:
         def websites_cb(url, proxies):
             if proxy_found_callback: proxy_found_callback(general_scraper_name, url, list(proxies))
-        tasks_to_run[general_scraper_name] = lambda verbose: scrape_proxies(
-            scrape_targets, verbose=verbose, max_workers=args.threads, 
-            respect_robots_txt=args.compliant, callback=websites_cb
+        # Called as func(verbose), which lands in scrape_proxies' second positional parameter
+        tasks_to_run[general_scraper_name] = partial(
+            scrape_proxies, scrape_targets, max_workers=args.threads,
+            respect_robots_txt=args.compliant, callback=websites_cb, executor=url_executor
         )
 
     # 3. Discovery scraper
@@ -255,19 +388,15 @@ def run_scraper_pipeline(
         
         # Deduplicate against Websites
         if general_scraper_name in tasks_to_run:
-            existing_urls = {convert_to_jsdelivr_url(t[0]) for t in scrape_targets}
+            existing_urls = {source_dedup_key(t[0]) for t in scrape_targets}
             # Also dedup domains roughly
-            existing_domains = {urlparse(u).netloc.replace("www.", "") for u in existing_urls}
-            
-            filtered_urls = []
-            for d_url in discovered_urls:
-                try:
-                    conv_url = convert_to_jsdelivr_url(d_url)
-                    netloc = urlparse(conv_url).netloc.replace("www.", "")
-                    if conv_url not in existing_urls and netloc not in existing_domains:
-                        filtered_urls.append(d_url)
-                except: pass
-            discovered_urls = filtered_urls
+            existing_domains = {url_host(u) for u in existing_urls}
+            existing_domains.discard('')
+
+            discovered_urls = [
+                d_url for d_url in discovered_urls
+                if (conv_url := source_dedup_key(d_url)) not in existing_urls and url_host(conv_url) not in existing_domains
+            ]
 
         if not discovered_urls: return []
 
@@ -275,7 +404,7 @@ def run_scraper_pipeline(
         def internal_cb(url, proxies):
             if proxy_found_callback: proxy_found_callback(discovery_scraper_name, url, list(proxies))
 
-        proxies, _ = scrape_proxies(targets, verbose=verbose, max_workers=args.threads, respect_robots_txt=args.compliant, callback=internal_cb)
+        proxies, _ = scrape_proxies(targets, verbose=verbose, max_workers=args.threads, respect_robots_txt=args.compliant, callback=internal_cb, executor=url_executor)
         return proxies
     
     tasks_to_run[discovery_scraper_name] = run_discovery_scraper
@@ -291,11 +420,11 @@ def run_scraper_pipeline(
     scraper_name_map = {name.lower(): name for name in tasks_to_run.keys()}
     if args.only:
         allowed = {scraper_name_map[n.lower()] for n in args.only if n.lower() in scraper_name_map}
-        tasks_to_run = {n: f for n, f in tasks_to_run.items() if n in allowed}
+        for name in tasks_to_run.keys() - allowed: del tasks_to_run[name]
         print(f"--- Running ONLY: {', '.join(tasks_to_run.keys())} ---", flush=True)
     elif args.exclude:
         excluded = {scraper_name_map[n.lower()] for n in args.exclude if n.lower() in scraper_name_map}
-        tasks_to_run = {n: f for n, f in tasks_to_run.items() if n not in excluded}
+        for name in excluded: del tasks_to_run[name]
         print(f"--- EXCLUDING: {', '.join(excluded)} ---", flush=True)
 
     if not args.only and not args.use_browser_automation:
@@ -311,7 +440,10 @@ def run_scraper_pipeline(
 
     # Headful automation check
     if any(name in tasks_to_run for name in HEADFUL_SCRAPERS) and sys.platform == "linux" and not os.environ.get('DISPLAY'):
-        if shutil.which("xvfb-run"):
+        if Display is not None and start_virtual_display():
+            # DISPLAY is now set here, and the spawned automation workers inherit it
+            pass
+        elif shutil.which("xvfb-run"):
             print("[INFO] Re-launching with xvfb-run...", flush=True)
             subprocess.run([shutil.which("xvfb-run"), '--auto-servernum', sys.executable, *sys.argv])
             sys.exit(0)
@@ -319,22 +451,40 @@ def run_scraper_pipeline(
             print("[ERROR] xvfb-run missing for headful scrapers.", flush=True)
             sys.exit(1)
 
-    if any(name in tasks_to_run for name in AUTOMATION_SCRAPER_NAMES):
-        pre_run_browser_setup()
-
-    results = {}
-    successful_general_urls = []
+    results: Dict[str, int] = {}
+    # Proxies are stripped, reserved-IP filtered and deduplicated as each scraper completes
+    unique_proxies = set()
+    successful_general_urls: Set[str] = set()
     
-    automation_tasks = {n: f for n, f in tasks_to_run.items() if n in AUTOMATION_SCRAPER_NAMES}
-    normal_tasks = {n: f for n, f in tasks_to_run.items() if n not in AUTOMATION_SCRAPER_NAMES}
-    headful_automation = {n: f for n, f in automation_tasks.items() if n in HEADFUL_SCRAPERS}
-    headless_automation = {n: f for n, f in automation_tasks.items() if n not in HEADFUL_SCRAPERS}
-
-    executors = []
-    future_to_scraper = {}
+    # Partition in one pass, preserving registration order within each group
+    normal_tasks, headless_automation, headful_automation = {}, {}, {}
+    for name, func in tasks_to_run.items():
+        if name not in AUTOMATION_SCRAPER_NAMES: normal_tasks[name] = func
+        elif name in HEADFUL_SCRAPERS: headful_automation[name] = func
+        else: headless_automation[name] = func
+
+    executors = [url_executor]
+    pending_futures = set()
+
+    def submit_scraper(ex, name, fn, *fn_args):
+        # The scraper name rides on the future itself, so completion needs no side lookup
+        future = ex.submit(fn, *fn_args)
+        future.scraper_name = name
+        pending_futures.add(future)
+
+    task_stats = load_task_stats()
+    # Set by the worker when a regular scraper actually starts, so time spent queued isn't counted
+    started_at: Dict[str, float] = {}
+    def run_timed(name, fn, *fn_args):
+        started_at[name] = time.monotonic()
+        return fn(*fn_args)
     
+    # Resolved on termination so the blocking completion wait below returns immediately
+    stop_signal = Future()
+
     def shutdown_all():
         for ex in executors: ex.shutdown(wait=False, cancel_futures=True)
+        if not stop_signal.done(): stop_signal.set_result(None)
 
     # Use a custom context manager depending on whether we handle signals or not
     @contextmanager
@@ -353,73 +503,102 @@ def run_scraper_pipeline(
                 handler.unregister_callback(shutdown_all)
 
     with safe_termination_context():
+        automation_ex = browser_warmup = None
+        if headless_automation or headful_automation:
+            sweep_stale_profiles()
+            automation_ex = _automation_executor(args.automation_threads if headless_automation else 0, 1 if headful_automation else 0)
+            executors.append(automation_ex)
+            if uc_driver_cached():
+                print("[INFO] Browser driver already cached, skipping pre-flight check.", flush=True)
+            else:
+                # The first worker fetches the driver and warms its browser while the network-bound regular scrapers run
+                browser_warmup = automation_ex.submit(pre_run_browser_setup, not headless_automation)
+
         if normal_tasks:
             print(f"--- Submitting {len(normal_tasks)} regular scraper(s)...", flush=True)
-            ex = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='NormalScraper')
-            executors.append(ex)
-            for name, func in normal_tasks.items():
-                future_to_scraper[ex.submit(func, args.verbose)] = name
-
-        if headless_automation:
-            print(f"--- Submitting {len(headless_automation)} headless automation scraper(s)...", flush=True)
-            ex = ThreadPoolExecutor(max_workers=args.automation_threads, thread_name_prefix='HeadlessAutomation')
+            # Each regular scraper is a single task, so never size the pool beyond the task count
+            ex = ThreadPoolExecutor(max_workers=min(threads, max(len(normal_tasks), MIN_SCRAPER_WORKERS)), thread_name_prefix='NormalScraper')
             executors.append(ex)
-            for name, func in headless_automation.items():
-                future_to_scraper[ex.submit(run_automation_task, name, func, args.verbose, False, args.turnstile_delay)] = name
-
-        if headful_automation:
-            print(f"--- Submitting {len(headful_automation)} headful scraper(s)...", flush=True)
-            ex = ThreadPoolExecutor(max_workers=1, thread_name_prefix='HeadfulAutomation')
-            executors.append(ex)
-            for name, func in headful_automation.items():
-                future_to_scraper[ex.submit(run_automation_task, name, func, args.verbose, True, args.turnstile_delay)] = name
-
-        pending_futures = set(future_to_scraper.keys())
-        while pending_futures:
-            if should_terminate(): break
-            done, _ = wait(pending_futures, timeout=0.5, return_when=FIRST_COMPLETED)
-            if not done: continue
-            
-            for future in done:
-                pending_futures.remove(future)
-                name = future_to_scraper.get(future)
-                try:
-                    res = future.result()
-                    proxies = []
-                    if name == general_scraper_name:
-                        proxies, urls = res
-                        successful_general_urls.extend(urls)
-                    else:
-                        proxies = res
+            # Longest-first, so the slow scrapers don't end up alone at the tail once the pool is saturated
+            for name, func in sorted(normal_tasks.items(), key=lambda kv: task_stats.get(kv[0], DEFAULT_TASK_DURATION), reverse=True):
+                submit_scraper(ex, name, run_timed, name, func, args.verbose)
+
+        if browser_warmup: wait([browser_warmup])
+
+        # Skip launching browsers if Ctrl+C arrived while the driver was being prepared
+        if automation_ex and not should_terminate():
+            ex = automation_ex
+            if headless_automation:
+                print(f"--- Submitting {len(headless_automation)} headless automation scraper(s)...", flush=True)
+                for name, func in headless_automation.items():
+                    submit_scraper(ex, name, run_automation_task, name, func, args.verbose, False, args.turnstile_delay)
+            if headful_automation:
+                print(f"--- Submitting {len(headful_automation)} headful scraper(s)...", flush=True)
+                for name, func in headful_automation.items():
+                    submit_scraper(ex, name, run_automation_task, name, func, args.verbose, True, args.turnstile_delay)
+
+        while pending_futures and not should_terminate():
+            try:
+                for future in as_completed(pending_futures | {stop_signal}, timeout=COMPLETION_WAKEUP_INTERVAL):
+                    if future is stop_signal or should_terminate(): break
+                    pending_futures.remove(future)
+                    name = future.scraper_name
+                    try:
+                        # Scrapers may return any iterable of "ip:port" strings; sets are merged as-is without sorting
+                        res = future.result()
+                        proxies = []
+                        if name == general_scraper_name:
+                            proxies, urls = res
+                            successful_general_urls.update(urls)
+                        else:
+                            proxies = res
                     
-                    results[name] = proxies
-                    # For non-streaming scrapers, we invoke callback here with full results
-                    if name != general_scraper_name and name != discovery_scraper_name and proxy_found_callback:
-                        proxy_found_callback(name, "N/A", proxies)
+                        # Only the count is kept per scraper, so each result can be freed once merged
+                        results[name] = len(proxies)
+                        if proxies: unique_proxies.update(VALID_PROXY_LINE_REGEX.findall('\n'.join(map(str.strip, filter(None, proxies)))))
+                        # For non-streaming scrapers, we invoke callback here with full results
+                        if name != general_scraper_name and name != discovery_scraper_name and proxy_found_callback:
+                            proxy_found_callback(name, "N/A", proxies)
                         
-                    print(f"[COMPLETED] '{name}' finished, found {len(proxies)} proxies.", flush=True)
-                except Exception as e:
-                    print(f"[ERROR] Scraper '{name}' failed: {e}", flush=True)
+                        print(f"[COMPLETED] '{name}' finished, found {len(proxies)} proxies.", flush=True)
+                    except Exception as e:
+                        print(f"[ERROR] Scraper '{name}' failed: {e}", flush=True)
+                    if name in started_at:
+                        duration = time.monotonic() - started_at[name]
+                        task_stats[name] = (1 - TASK_STATS_ALPHA) * task_stats.get(name, duration) + TASK_STATS_ALPHA * duration
+                    # stop_signal never resolves on a normal run, so leave once the real work is done
+                    if not pending_futures: break
+            except TimeoutError:
+                continue
         
         for ex in executors: ex.shutdown(wait=True, cancel_futures=True)
 
-    combined_proxies = {p for proxy_list in results.values() if proxy_list for p in proxy_list if p and p.strip()}
-    final_proxies = sorted(list({p for p in combined_proxies if not INVALID_IP_REGEX.match(p)}))
+    if started_at: save_task_stats(task_stats)
+
+    final_proxies = sorted(unique_proxies, key=proxy_sort_key)
+    unique_proxies.clear()
     
     if final_proxies:
         save_proxies_to_file(final_proxies, args.output)
 
     if args.remove_dead_links and successful_general_urls:
         print(f"[INFO] Updating '{SITES_FILE}'...", flush=True)
+        tmp_path = None
         try:
-            with open(SITES_FILE, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            with open(SITES_FILE, 'w', encoding='utf-8') as f:
-                for line in lines:
-                    if not line.strip() or line.strip().startswith('#') or line.split('|')[0].strip() in successful_general_urls:
-                        f.write(line)
+            # Stream into a temp file beside the original and swap it in atomically
+            with open(SITES_FILE, 'r', encoding='utf-8') as src, \
+                 tempfile.NamedTemporaryFile('w', encoding='utf-8', delete=False, dir=os.path.dirname(os.path.abspath(SITES_FILE))) as tmp:
+                tmp_path = tmp.name
+                tmp.writelines([
+                    line for line in src
+                    if not (stripped := line.strip()) or stripped[0] == '#' or stripped.split('|', 1)[0].strip() in successful_general_urls
+                ])
+            # NamedTemporaryFile creates its file as 0600; keep the sites file's own permissions
+            shutil.copymode(SITES_FILE, tmp_path)
+            os.replace(tmp_path, SITES_FILE)
         except Exception as e:
             print(f"[ERROR] Failed to update sites file: {e}", flush=True)
+            if tmp_path and os.path.exists(tmp_path): os.remove(tmp_path)
 
     return final_proxies, results
 
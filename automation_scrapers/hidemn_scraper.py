@@ -1,13 +1,103 @@
+import json
+import os
+import re
 import time
 import requests
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Set, Tuple
 from seleniumbase import BaseCase
 import helper.turnstile as turnstile
+from helper.json_utils import json_loads, JSONDecodeError
 
 from scrapers.proxy_scraper import extract_proxies_from_content
 
 URL_TEMPLATE = "https://hide.mn/en/proxy-list/?start={offset}"
 DELAY_SECONDS = 1.5
+# Transient gateway errors are retried on the same keep-alive connection pool instead of ending pagination
+REQUEST_RETRY = Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+# Cloudflare clearance from the last browser solve, reused by later runs while it is likely still valid
+CREDS_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.proxygather', 'hidemn_creds.json')
+CREDS_MAX_AGE = 25 * 60
+# Clearance this process last loaded or saved with its timestamp, so repeat runs in one worker skip the file
+_creds_memo: Tuple[float, dict] = (0.0, {})
+# Reads "ip:port" straight from the proxy table, so only the rows cross the WebDriver bridge instead of the whole page
+TABLE_ROWS_SCRIPT = """
+return Array.from(document.querySelectorAll('table.proxy__t tbody tr'), r => r.cells)
+  .filter(c => c.length >= 2)
+  .map(c => c[0].innerText.trim() + ':' + c[1].innerText.trim());
+"""
+# IP and port in adjacent table cells, matched on the raw response bytes so the ASCII-only page is never decoded
+TABLE_CELLS_RE = re.compile(rb'<td>\s*(\d{1,3}(?:\.\d{1,3}){3})\s*</td>\s*<td>\s*(\d{1,5})\s*</td>')
+
+def _fetch_page(session: requests.Session, url: str, not_before: float) -> Tuple[float, bytes]:
+    """Requests a list page once `not_before` (monotonic time) has passed; returns when it was requested and the raw HTML."""
+    delay = not_before - time.monotonic()
+    if delay > 0: time.sleep(delay)
+    requested_at = time.monotonic()
+    response = session.get(url, timeout=20)
+    response.raise_for_status()
+    return requested_at, response.content
+
+def _is_challenge(content: bytes) -> bool:
+    return b'Verifying you are human' in content or b'challenges.cloudflare.com' in content
+
+def _load_cached_creds() -> dict:
+    """Returns the saved cookies and headers if they are younger than CREDS_MAX_AGE, else {}."""
+    global _creds_memo
+    saved_at, creds = _creds_memo
+    if creds and time.time() - saved_at <= CREDS_MAX_AGE: return creds
+    try:
+        saved_at = os.path.getmtime(CREDS_CACHE_FILE)
+        if time.time() - saved_at > CREDS_MAX_AGE: return {}
+        with open(CREDS_CACHE_FILE, 'rb') as f:
+            creds = json_loads(f.read())
+    except (OSError, JSONDecodeError):
+        return {}
+    if not (isinstance(creds, dict) and 'cookies' in creds and 'headers' in creds): return {}
+    _creds_memo = (saved_at, creds)
+    return creds
+
+def _save_creds(creds: dict) -> None:
+    global _creds_memo
+    # Unchanged clearance is already on disk; only a new solve is written
+    if creds == _creds_memo[1]: return
+    _creds_memo = (time.time(), creds)
+    tmp_path = CREDS_CACHE_FILE + '.tmp'
+    try:
+        os.makedirs(os.path.dirname(CREDS_CACHE_FILE), exist_ok=True)
+        # The clearance cookie is a credential, so keep the file private to the user
+        with open(tmp_path, 'w', encoding='utf-8', opener=lambda path, flags: os.open(path, flags, 0o600)) as f:
+            json.dump(creds, f)
+        os.replace(tmp_path, CREDS_CACHE_FILE)
+    except OSError:
+        pass
+
+def _forget_creds() -> None:
+    """Drops a clearance Cloudflare rejected, so later runs don't try it again."""
+    global _creds_memo
+    _creds_memo = (0.0, {})
+    try: os.remove(CREDS_CACHE_FILE)
+    except OSError: pass
+
+def _extract_page_proxies(content: bytes, known: Optional[Set[str]] = None) -> Set[str]:
+    """Returns the proxies in a fetched list page, leaving out any already in `known`."""
+    matches = TABLE_CELLS_RE.findall(content)
+    if not matches:
+        # Table markup changed; fall back to the general extractor, which works on decoded text
+        return extract_proxies_from_content(content.decode('utf-8', 'replace'), verbose=False, known=known)
+    # One join and one decode for the whole page instead of one per match
+    found = set(b'\n'.join([ip + b':' + port for ip, port in matches]).decode('ascii').split('\n'))
+    if known: found.difference_update(known)
+    return found
+
+def _scrape_table_rows(sb: BaseCase, known: Optional[Set[str]] = None) -> Set[str]:
+    """Returns the proxies in the table currently loaded in the browser, leaving out any already in `known`."""
+    rows = sb.execute_script(TABLE_ROWS_SCRIPT)
+    if rows: return set(rows).difference(known) if known else set(rows)
+    # Table markup changed or missing; fall back to scanning the full page
+    return extract_proxies_from_content(sb.get_page_source(), verbose=False, known=known)
 
 def _solve_challenge_and_get_creds(sb: BaseCase, url: str, verbose: bool, turnstile_delay: float = 0) -> dict:
     """
@@ -73,7 +163,7 @@ def _solve_challenge_and_get_creds(sb: BaseCase, url: str, verbose: bool, turnst
             print(f"[ERROR] Hide.mn: Failed to solve challenge or extract credentials: {e}", flush=True)
         return {}
 
-def scrape_from_hidemn(sb: BaseCase, verbose: bool = False, turnstile_delay: float = 0) -> List[str]:
+def scrape_from_hidemn(sb: BaseCase, verbose: bool = False, turnstile_delay: float = 0) -> Set[str]:
     """
     Scrapes hide.mn by first using a browser to solve Cloudflare, then
     switching to direct requests with the obtained session cookies.
@@ -83,36 +173,63 @@ def scrape_from_hidemn(sb: BaseCase, verbose: bool = False, turnstile_delay: flo
 
     all_proxies = set()
     session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=REQUEST_RETRY))
+    # Single worker, so list pages are still requested one at a time
+    prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix='HidemnPrefetch')
 
     try:
         initial_url = URL_TEMPLATE.format(offset=0)
-        creds = _solve_challenge_and_get_creds(sb, initial_url, verbose, turnstile_delay)
+        first_page = None
+        # When the first page was loaded; the browser solve loads it just before the prefetch below
+        first_requested_at = None
 
-        if not creds:
-            print("[ERROR] Hide.mn: Could not get initial Cloudflare credentials. Aborting.", flush=True)
-            return []
-            
-        session.cookies.update(creds['cookies'])
-        session.headers.update(creds['headers'])
-        
-        page_content = sb.get_page_source()
-        initial_proxies = extract_proxies_from_content(page_content, verbose=False)
+        # A clearance saved by a recent run skips the browser solve entirely if Cloudflare still accepts it
+        creds = _load_cached_creds()
+        if creds:
+            session.cookies.update(creds['cookies'])
+            session.headers.update(creds['headers'])
+            try:
+                first_requested_at, first_page = _fetch_page(session, initial_url, 0.0)
+                if _is_challenge(first_page): first_page = None
+            except requests.RequestException:
+                first_page = None
+            if first_page is None:
+                if verbose: print("[INFO] Hide.mn: Saved Cloudflare clearance was rejected. Solving again.", flush=True)
+                session.cookies.clear()
+                _forget_creds()
+            elif verbose:
+                print("[INFO] Hide.mn: Reusing saved Cloudflare clearance.", flush=True)
+
+        if first_page is None:
+            creds = _solve_challenge_and_get_creds(sb, initial_url, verbose, turnstile_delay)
+
+            if not creds:
+                print("[ERROR] Hide.mn: Could not get initial Cloudflare credentials. Aborting.", flush=True)
+                return set()
+
+            _save_creds(creds)
+            session.cookies.update(creds['cookies'])
+            session.headers.update(creds['headers'])
+
+        offset = 64
+        if first_page is None: first_requested_at = time.monotonic()
+        next_page = prefetcher.submit(_fetch_page, session, URL_TEMPLATE.format(offset=offset), first_requested_at + DELAY_SECONDS)
+
+        initial_proxies = _scrape_table_rows(sb) if first_page is None else _extract_page_proxies(first_page)
         all_proxies.update(initial_proxies)
         if verbose:
             print(f"[INFO]   ... Hide.mn: Found {len(initial_proxies)} proxies on first page. Total unique: {len(all_proxies)}.", flush=True)
 
-        offset = 64
         while True:
             url = URL_TEMPLATE.format(offset=offset)
             if verbose:
                 print(f"[INFO] Hide.mn: Making direct request to page with offset {offset}...", flush=True)
 
             try:
-                response = session.get(url, timeout=20)
-                response.raise_for_status()
-                page_content = response.text
+                requested_at, page_content = next_page.result()
+                newly_found = None
 
-                if 'Verifying you are human' in page_content or 'challenges.cloudflare.com' in page_content:
+                if _is_challenge(page_content):
                     if verbose:
                         print("[WARN] Hide.mn: Cloudflare challenge re-appeared. Re-solving with browser...", flush=True)
 
@@ -121,31 +238,30 @@ def scrape_from_hidemn(sb: BaseCase, verbose: bool = False, turnstile_delay: flo
                         print("[ERROR] Hide.mn: Failed to re-solve challenge. Aborting.", flush=True)
                         break
                     
+                    _save_creds(new_creds)
                     session.cookies.update(new_creds['cookies'])
                     session.headers.update(new_creds['headers'])
-                    page_content = sb.get_page_source()
-
-                if "No proxies found" in page_content:
+                    newly_found = _scrape_table_rows(sb, known=all_proxies)
+                    requested_at = time.monotonic()
+                elif b"No proxies found" in page_content:
                     if verbose: print(f"[INFO] Hide.mn: Page reports no more proxies.", flush=True)
                     break
 
-                newly_found = extract_proxies_from_content(page_content, verbose=False)
+                # Queue the next page before parsing this one, so its download overlaps parsing and the politeness delay
+                next_page = prefetcher.submit(_fetch_page, session, URL_TEMPLATE.format(offset=offset + 64), requested_at + DELAY_SECONDS)
+
+                # Only proxies not seen on earlier pages come back, so an empty result covers both an empty page and a repeated one
+                if newly_found is None: newly_found = _extract_page_proxies(page_content, known=all_proxies)
                 if not newly_found:
-                    if verbose: print(f"[INFO]   ... No proxies found on this page. Assuming end of list.", flush=True)
+                    if verbose: print(f"[INFO]   ... Hide.mn: No new proxies on this page. Assuming end of list.", flush=True)
                     break
-                    
-                initial_count = len(all_proxies)
+
                 all_proxies.update(newly_found)
 
                 if verbose:
-                    print(f"[INFO]   ... Hide.mn: Found {len(newly_found)} proxies. Total unique: {len(all_proxies)}.", flush=True)
-
-                if len(all_proxies) == initial_count:
-                    if verbose: print("[INFO]   ... Hide.mn: No new unique proxies found. Stopping.", flush=True)
-                    break
+                    print(f"[INFO]   ... Hide.mn: Found {len(newly_found)} new proxies. Total unique: {len(all_proxies)}.", flush=True)
                 
                 offset += 64
-                time.sleep(DELAY_SECONDS)
 
             except requests.RequestException as e:
                 if verbose:
@@ -155,8 +271,12 @@ def scrape_from_hidemn(sb: BaseCase, verbose: bool = False, turnstile_delay: flo
     except Exception as e:
         if verbose:
             print(f"[ERROR] A critical exception occurred in Hide.mn scraper: {e}", flush=True)
+    finally:
+        # Drops the page prefetched past the end of the list
+        prefetcher.shutdown(wait=False, cancel_futures=True)
 
     if verbose:
         print(f"[INFO] Hide.mn: Finished. Found a total of {len(all_proxies)} unique proxies.", flush=True)
     
-    return sorted(list(all_proxies))
\ No newline at end of file
+    # Returned unsorted; the pipeline merges it into its own set and sorts once at the end
+    return all_proxies
\ No newline at end of file
@@ -1,87 +1,134 @@
 import time
 import requests
 import re
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Set
 from seleniumbase import BaseCase
+from helper.log_writer import log
 
 from scrapers.proxy_scraper import extract_proxies_from_content
 
 BROWSER_VISIT_URL = "https://openproxylist.com/proxy/"
 POST_TARGET_URL = "https://openproxylist.com/get-list.html"
+RECAPTCHA_SCRIPT_SELECTOR = 'script[src*="recaptcha/api.js?render="]'
+SITE_KEY_REGEX = re.compile(r'recaptcha/api\.js\?render=([\w-]+)')
+# Upper bound on waiting for the reCAPTCHA library to become usable, polled every RECAPTCHA_POLL_INTERVAL
+RECAPTCHA_READY_TIMEOUT = 10
+RECAPTCHA_POLL_INTERVAL = 0.1
+RECAPTCHA_READY_SCRIPT = "return typeof grecaptcha !== 'undefined' && typeof grecaptcha.execute === 'function'"
+# Pages requested concurrently per batch of reCAPTCHA tokens
+PAGE_BATCH_SIZE = 8
+# Form fields that are the same for every page; requests encodes field tuples without building a dict
+POST_FIXED_FIELDS = (('response', ''), ('sort', 'sortlast'))
 
-def scrape_from_openproxylist(sb: BaseCase, verbose: bool = False, turnstile_delay: float = 0) -> List[str]:
+def _fetch_page(session: requests.Session, token: str, page_num: int) -> Set[str]:
+    post_data = POST_FIXED_FIELDS + (('g-recaptcha-response', token), ('page', page_num))
+    response = session.post(POST_TARGET_URL, data=post_data, timeout=20)
+    response.raise_for_status()
+    return extract_proxies_from_content(response.text, verbose=False)
+
+def _wait_for_recaptcha(sb: BaseCase, timeout: float = RECAPTCHA_READY_TIMEOUT) -> bool:
+    """Returns as soon as grecaptcha.execute is available, or False after `timeout` seconds."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if sb.execute_script(RECAPTCHA_READY_SCRIPT): return True
+        time.sleep(RECAPTCHA_POLL_INTERVAL)
+    return False
+
+def scrape_from_openproxylist(sb: BaseCase, verbose: bool = False, turnstile_delay: float = 0) -> Set[str]:
     """
     Scrapes OpenProxyList using its own dedicated browser instance.
     """
     if verbose:
-        print("[RUNNING] 'OpenProxyList' automation scraper has started.", flush=True)
+        log("[RUNNING] 'OpenProxyList' automation scraper has started.")
 
     all_proxies = set()
     
     try:
         if verbose:
-            print(f"[INFO] OpenProxyList: Navigating to {BROWSER_VISIT_URL}...", flush=True)
+            log(f"[INFO] OpenProxyList: Navigating to {BROWSER_VISIT_URL}...")
         sb.open(BROWSER_VISIT_URL)
         
-        sb.wait_for_element_present('script[src*="recaptcha/api.js?render="]', timeout=20)
-        
-        time.sleep(1.5)
+        sb.wait_for_element_present(RECAPTCHA_SCRIPT_SELECTOR, timeout=20)
 
-        html_content = sb.get_page_source()
-        site_key_regex = re.compile(r'recaptcha/api\.js\?render=([\w-]+)')
-        match = site_key_regex.search(html_content)
+        # The key is in the script URL, so there's no need to pull the whole page source
+        match = SITE_KEY_REGEX.search(sb.get_attribute(RECAPTCHA_SCRIPT_SELECTOR, 'src') or '')
         
         if not match:
             raise ValueError("Could not find reCAPTCHA site key.")
             
         recaptcha_site_key = match.group(1)
         if verbose:
-            print(f"[INFO] OpenProxyList: Found site key: {recaptcha_site_key}", flush=True)
+            log(f"[INFO] OpenProxyList: Found site key: {recaptcha_site_key}")
 
-        time.sleep(5)
+        if not _wait_for_recaptcha(sb) and verbose:
+            log(f"[WARN] OpenProxyList: reCAPTCHA not ready after {RECAPTCHA_READY_TIMEOUT}s, trying anyway.")
         
-        page_num = 1
         session = requests.Session()
+        # One keep-alive connection per in-flight page
+        session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=PAGE_BATCH_SIZE))
+        # A whole batch of tokens in one WebDriver round trip; a failed token comes back as null
+        js_command = (
+            f"return Promise.all(Array.from({{length: {PAGE_BATCH_SIZE}}}, "
+            f"() => grecaptcha.execute('{recaptcha_site_key}', {{action: 'proxy'}}).catch(() => null)))"
+        )
+        page_num = 1
+        finished = False
 
-        while True:
-            if verbose:
-                print(f"[INFO] OpenProxyList: Generating token for page {page_num}...", flush=True)
+        with ThreadPoolExecutor(max_workers=PAGE_BATCH_SIZE, thread_name_prefix='OpenProxyList') as executor:
+            while not finished:
+                if verbose:
+                    log(f"[INFO] OpenProxyList: Generating tokens for pages {page_num}-{page_num + PAGE_BATCH_SIZE - 1}...")
 
-            js_command = f"return grecaptcha.execute('{recaptcha_site_key}', {{action: 'proxy'}})"
-            token = sb.execute_script(js_command)
+                # Tokens are single-use, so one is generated per page before the batch is posted.
+                # Pages must stay contiguous, so the batch ends at the first failed token.
+                tokens = []
+                for token in sb.execute_script(js_command) or []:
+                    if not token: break
+                    tokens.append(token)
 
-            if not token:
-                if verbose: print(f"[WARN]   ... Failed to generate token. Stopping.", flush=True)
-                break
+                if not tokens:
+                    if verbose: log(f"[WARN]   ... Failed to generate token. Stopping.")
+                    break
 
-            post_data = {'g-recaptcha-response': token, 'response': '', 'sort': 'sortlast', 'page': str(page_num)}
-            
-            response = session.post(POST_TARGET_URL, data=post_data, timeout=20)
-            response.raise_for_status()
-            newly_found = extract_proxies_from_content(response.text, verbose=False)
-            
-            if not newly_found:
-                if verbose: print(f"[INFO]   ... No proxies found on page {page_num}. End of list.", flush=True)
-                break
+                futures = [executor.submit(_fetch_page, session, token, page_num + i) for i, token in enumerate(tokens)]
+
+                # Results are handled in page order, so the end-of-list checks behave as in a serial walk
+                for i, future in enumerate(futures):
+                    current_page = page_num + i
+                    newly_found = future.result()
+
+                    if not newly_found:
+                        if verbose: log(f"[INFO]   ... No proxies found on page {current_page}. End of list.")
+                        finished = True
+                        break
+
+                    # Only the unseen part is merged, so a page of repeats leaves all_proxies untouched
+                    new_unique = newly_found - all_proxies
+                    all_proxies |= new_unique
 
-            initial_count = len(all_proxies)
-            all_proxies.update(newly_found)
+                    if verbose:
+                        log(f"[INFO]   ... Found {len(newly_found)} proxies on page {current_page}. Total unique: {len(all_proxies)}.")
 
-            if verbose:
-                print(f"[INFO]   ... Found {len(newly_found)} proxies. Total unique: {len(all_proxies)}.", flush=True)
+                    if not new_unique and current_page > 1:
+                        if verbose: log("[INFO]   ... No new unique proxies found. Stopping.")
+                        finished = True
+                        break
 
-            if len(all_proxies) == initial_count and page_num > 1:
-                if verbose: print("[INFO]   ... No new unique proxies found. Stopping.", flush=True)
-                break
+                if finished: break
+                if len(tokens) < PAGE_BATCH_SIZE:
+                    if verbose: log(f"[WARN]   ... Failed to generate token. Stopping.")
+                    break
 
-            page_num += 1
-            time.sleep(1)
+                page_num += len(tokens)
+                time.sleep(1)
     
     except Exception as e:
         if verbose:
-            print(f"[ERROR] OpenProxyList scraper failed: {e}", flush=True)
+            log(f"[ERROR] OpenProxyList scraper failed: {e}")
 
     if verbose:
-        print(f"[INFO] OpenProxyList: Finished. Found a total of {len(all_proxies)} unique proxies.", flush=True)
+        log(f"[INFO] OpenProxyList: Finished. Found a total of {len(all_proxies)} unique proxies.")
     
-    return sorted(list(all_proxies))
\ No newline at end of file
+    return all_proxies
\ No newline at end of file
@@ -29,6 +29,11 @@ import re
 import random
 import json
 import time
+import threading
+
+REMOTE_ADDR_REGEX = re.compile(r'REMOTE_ADDR = (\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})')
+# Headers a judge echoes back when the proxy reveals that it is one; the first hit decides
+PRIVACY_HEADERS = ('VIA', 'X-FORWARDED-FOR', 'X-FORWARDED', 'FORWARDED-FOR', 'FORWARDED-FOR-IP', 'FORWARDED', 'CLIENT-IP', 'PROXY-CONNECTION')
 
 
 class ProxyChecker:
@@ -55,6 +60,9 @@ class ProxyChecker:
     def __init__(self, timeout: float = 10.0, verbose: bool = False):
         self.timeout_ms = int(timeout * 1000)
         self.verbose = verbose 
+        # One curl handle per worker thread, so DNS lookups and direct connections are reused between requests
+        self._local = threading.local()
+        self._closed = False
         
         initial_judges = [
             'http://proxyjudge.us/azenv.php',
@@ -89,9 +97,40 @@ class ProxyChecker:
         r = self._send_query_internal(url='https://api.ipify.org/')
         return r['response'] if r else ""
 
+    def close(self):
+        """Aborts in-flight transfers and makes all further queries fail immediately.
+
+        Frees the calling thread's curl handle; each worker frees its own once its current query returns.
+        """
+        self._closed = True
+        self._release_curl()
+
+    def _abort_if_closed(self, download_total, downloaded, upload_total, uploaded):
+        # libcurl polls this at least once per second, even while connecting; non-zero aborts the transfer
+        return 1 if self._closed else 0
+
+    def _get_curl(self):
+        c = getattr(self._local, 'curl', None)
+        if c is None:
+            c = pycurl.Curl()
+            self._local.curl = c
+        else:
+            c.reset()
+        return c
+
+    def _release_curl(self):
+        c = getattr(self._local, 'curl', None)
+        if c is not None:
+            self._local.curl = None
+            c.close()
+
     def _send_query_internal(self, proxy=False, url=None, user=None, password=None):
+        if self._closed:
+            self._release_curl()
+            return None
+
         response = BytesIO()
-        c = pycurl.Curl()
+        c = self._get_curl()
 
         if not url and not self.live_judges:
             return None
@@ -114,18 +153,26 @@ class ProxyChecker:
         c.setopt(c.SSL_VERIFYHOST, 0)
         c.setopt(c.SSL_VERIFYPEER, 0)
 
+        c.setopt(c.NOPROGRESS, False)
+        c.setopt(c.XFERINFOFUNCTION, self._abort_if_closed)
+
         if proxy:
             c.setopt(c.PROXY, proxy)
+            # Every proxied query opens its own connection, so CONNECT_TIME measures the proxy rather than a reused socket
+            c.setopt(pycurl.FRESH_CONNECT, 1)
+            c.setopt(pycurl.FORBID_REUSE, 1)
 
         try:
             c.perform()
+            http_code = c.getinfo(c.HTTP_CODE)
+            connect_time = c.getinfo(c.CONNECT_TIME)
         except Exception as e:
             return None
-
-        http_code = c.getinfo(c.HTTP_CODE)
+        finally:
+            if self._closed: self._release_curl()
 
         if http_code == 200:
-            timeout = round(c.getinfo(c.CONNECT_TIME) * 1000)
+            timeout = round(connect_time * 1000)
             return {'timeout': timeout, 'response': response.getvalue().decode('iso-8859-1'), 'judge': request_url}
         else:
             return http_code
@@ -140,8 +187,7 @@ class ProxyChecker:
     def _parse_anonymity(self, r):
         if self.ip in r:
             return 'Transparent'
-        privacy_headers = ['VIA', 'X-FORWARDED-FOR', 'X-FORWARDED', 'FORWARDED-FOR', 'FORWARDED-FOR-IP', 'FORWARDED', 'CLIENT-IP', 'PROXY-CONNECTION']
-        if any([header in r for header in privacy_headers]):
+        if any(header in r for header in PRIVACY_HEADERS):
             return 'Anonymous'
         return 'Elite'
 
@@ -200,7 +246,7 @@ class ProxyChecker:
         if not protocols:
             return False
 
-        r = protocols[random.choice(list(protocols.keys()))]['response']
+        r = random.choice(list(protocols.values()))['response']
         
         if check_country:
             country = self.get_country(proxy.split(':')[0])
@@ -219,8 +265,7 @@ class ProxyChecker:
             final_result['country_code'] = country[1]
 
         if check_address:
-            remote_regex = r'REMOTE_ADDR = (\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'
-            remote_addr = re.search(remote_regex, r)
+            remote_addr = REMOTE_ADDR_REGEX.search(r)
             if remote_addr:
                 final_result['remote_address'] = remote_addr.group(1)
 
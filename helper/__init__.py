@@ -7,16 +7,26 @@ This package contains various utility modules used across the project.
 from helper.termination import (
     termination_context,
     should_terminate,
+    wait_for_termination,
     get_termination_handler,
     TerminationHandler,
 )
-from helper.request_utils import get_with_retry, post_with_retry
+from helper.request_utils import get_session, get_with_retry, post_with_retry
+from helper.log_writer import BufferedLogWriter, get_log_writer, log
+from helper.json_utils import json_loads, JSONDecodeError
 
 __all__ = [
     'termination_context',
     'should_terminate',
+    'wait_for_termination',
     'get_termination_handler',
     'TerminationHandler',
+    'get_session',
     'get_with_retry',
     'post_with_retry',
+    'BufferedLogWriter',
+    'get_log_writer',
+    'log',
+    'json_loads',
+    'JSONDecodeError',
 ]
@@ -0,0 +1,170 @@
+"""
+Per-thread pool of SeleniumBase browsers for the automation scrapers.
+Each worker thread keeps one browser per mode (headless/headful) and reuses it
+for consecutive tasks, so Chrome and the UC driver are launched once per worker
+instead of once per scraper.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List
+
+from seleniumbase import SB
+
+# Tasks served by one browser before it is replaced, so long runs don't accumulate Chrome memory
+BROWSER_MAX_USES = 20
+# Prefix for temporary browser profiles, so leftovers from crashed runs can be recognised and swept
+PROFILE_DIR_PREFIX = 'proxygather_profile_'
+# Leftover profiles older than this are considered abandoned
+STALE_PROFILE_AGE = 3600
+
+# Chrome profiles are tens of megabytes; delete them off the worker so the next launch isn't delayed
+_CLEANUP_EX = ThreadPoolExecutor(max_workers=2, thread_name_prefix='TempCleanup')
+_pending_cleanups = set()
+_pending_cleanups_lock = threading.Lock()
+
+_LOCAL = threading.local()
+_all_browsers: List["_PooledBrowser"] = []
+_all_browsers_lock = threading.Lock()
+
+
+class _PooledBrowser:
+    __slots__ = ('context', 'sb', 'temp_dir', 'uses')
+
+    def __init__(self, context, sb, temp_dir: str):
+        self.context = context
+        self.sb = sb
+        self.temp_dir = temp_dir
+        self.uses = 0
+
+    def close(self) -> None:
+        try: self.context.__exit__(None, None, None)
+        except Exception: pass
+        _remove_dir_later(self.temp_dir)
+
+
+def _remove_dir_later(path: str) -> None:
+    try:
+        future = _CLEANUP_EX.submit(shutil.rmtree, path, ignore_errors=True)
+    except RuntimeError:
+        # Interpreter shutdown (e.g. from atexit) no longer accepts new work; delete inline
+        shutil.rmtree(path, ignore_errors=True)
+        return
+    with _pending_cleanups_lock: _pending_cleanups.add(future)
+    future.add_done_callback(_forget_cleanup)
+
+
+def _forget_cleanup(future) -> None:
+    with _pending_cleanups_lock: _pending_cleanups.discard(future)
+
+
+def _thread_browsers() -> Dict[bool, _PooledBrowser]:
+    browsers = getattr(_LOCAL, 'browsers', None)
+    if browsers is None: browsers = _LOCAL.browsers = {}
+    return browsers
+
+
+def _reset_browser(sb) -> None:
+    """Clears state left by the previous task so the next scraper starts clean."""
+    # delete_all_cookies() only covers the current domain; CDP clears the whole jar
+    try: sb.driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+    except Exception: sb.driver.delete_all_cookies()
+    windows = sb.driver.window_handles
+    for handle in windows[1:]:
+        sb.driver.switch_to.window(handle)
+        sb.driver.close()
+    sb.driver.switch_to.window(windows[0])
+    sb.open("about:blank")
+
+
+def _launch_browser(is_headful: bool) -> _PooledBrowser:
+    temp_dir = tempfile.mkdtemp(prefix=PROFILE_DIR_PREFIX)
+    try:
+        context = SB(uc=True, headed=is_headful, headless2=(not is_headful), disable_csp=True, user_data_dir=temp_dir)
+        sb = context.__enter__()
+    except Exception:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+    browser = _PooledBrowser(context, sb, temp_dir)
+    with _all_browsers_lock: _all_browsers.append(browser)
+    return browser
+
+
+def acquire_browser(is_headful: bool):
+    """
+    Returns this thread's browser for the given mode, launching one with a fresh
+    temporary profile on first use and resetting it on reuse. A browser that has
+    served BROWSER_MAX_USES tasks is replaced with a new one.
+    """
+    browsers = _thread_browsers()
+    browser = browsers.get(is_headful)
+    if browser is not None:
+        with _all_browsers_lock: still_open = browser in _all_browsers
+        if not still_open:
+            # Closed by close_all_browsers() since this thread last used it
+            del browsers[is_headful]
+            browser = None
+        elif browser.uses >= BROWSER_MAX_USES:
+            discard_browser(is_headful)
+            browser = None
+    if browser is not None:
+        try:
+            _reset_browser(browser.sb)
+            browser.uses += 1
+            return browser.sb
+        except Exception:
+            discard_browser(is_headful)
+
+    browser = browsers[is_headful] = _launch_browser(is_headful)
+    browser.uses += 1
+    return browser.sb
+
+
+def warm_browser(is_headful: bool):
+    """Launches this thread's browser for the given mode ahead of its first task, without counting a use."""
+    browsers = _thread_browsers()
+    if is_headful not in browsers: browsers[is_headful] = _launch_browser(is_headful)
+    return browsers[is_headful].sb
+
+
+def discard_browser(is_headful: bool) -> None:
+    """Closes this thread's browser for the given mode, e.g. after a scraper crashed it."""
+    browser = _thread_browsers().pop(is_headful, None)
+    if browser is None: return
+    with _all_browsers_lock:
+        if browser in _all_browsers: _all_browsers.remove(browser)
+    browser.close()
+
+
+def close_all_browsers() -> None:
+    """Closes every pooled browser across all threads and waits until their profiles are removed."""
+    with _all_browsers_lock:
+        browsers = _all_browsers[:]
+        _all_browsers.clear()
+    for browser in browsers: browser.close()
+    with _pending_cleanups_lock: pending = list(_pending_cleanups)
+    wait(pending)
+
+
+def sweep_stale_profiles(max_age: float = STALE_PROFILE_AGE) -> None:
+    """Queues removal of profiles left in the temp dir by earlier runs that did not exit cleanly."""
+    cutoff = time.time() - max_age
+    try:
+        with os.scandir(tempfile.gettempdir()) as entries:
+            for entry in entries:
+                try:
+                    if entry.name.startswith(PROFILE_DIR_PREFIX) and entry.is_dir(follow_symlinks=False) \
+                            and entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                        _remove_dir_later(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+
+
+atexit.register(close_all_browsers)
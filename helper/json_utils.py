@@ -0,0 +1,23 @@
+"""
+JSON decoding with an optional fast path.
+Uses orjson when it is installed and falls back to the standard json module otherwise.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses this, so callers only need to catch one type
+JSONDecodeError = json.JSONDecodeError
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Decodes JSON with orjson if available, retrying with json for input only it accepts (NaN, Infinity)."""
+    if orjson is not None:
+        try: return orjson.loads(data)
+        except orjson.JSONDecodeError: pass
+    return json.loads(data)
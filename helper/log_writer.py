@@ -0,0 +1,111 @@
+"""
+Background console writer for high-volume log output.
+Callers queue text and a single thread writes it out in batches, so hot loops
+never block on the stdout lock or pay for a flush per line.
+"""
+
+import atexit
+import queue
+import sys
+import threading
+import time
+from typing import Optional, TextIO
+
+# Messages queued before log() blocks; bounds memory if stdout stalls
+LOG_QUEUE_MAXSIZE = 10000
+
+
+class BufferedLogWriter:
+    """
+    Writes queued text to a stream from a dedicated daemon thread.
+
+    Output is flushed at most every `flush_interval` seconds. Text written after
+    close() goes straight to the stream, so late messages are never lost.
+    """
+
+    _SENTINEL = object()
+
+    def __init__(self, stream: Optional[TextIO] = None, flush_interval: float = 0.1, maxsize: int = 0):
+        self._stream = stream
+        self._flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    @property
+    def stream(self) -> TextIO:
+        # Resolved lazily so redirected stdout is honoured
+        return self._stream or sys.stdout
+
+    def start(self) -> "BufferedLogWriter":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="BufferedLogWriter", daemon=True)
+            self._thread.start()
+        return self
+
+    def write(self, text: str) -> None:
+        """Queues text for output; writes it directly once the writer is closed."""
+        if self._closed or self._thread is None:
+            self.stream.write(text)
+            self.stream.flush()
+            return
+        self._queue.put(text)
+
+    def close(self) -> None:
+        """Flushes everything queued so far and stops the writer thread."""
+        if self._closed: return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(self._SENTINEL)
+            self._thread.join()
+
+    def __enter__(self) -> "BufferedLogWriter":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        buffer = []
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                item = None
+            if item is self._SENTINEL:
+                self._flush(buffer)
+                return
+            if item is not None:
+                buffer.append(item)
+            if buffer and time.monotonic() - last_flush >= self._flush_interval:
+                self._flush(buffer)
+                last_flush = time.monotonic()
+
+    def _flush(self, buffer: list) -> None:
+        if not buffer: return
+        try:
+            self.stream.write(''.join(buffer))
+            self.stream.flush()
+        except (IOError, ValueError):
+            pass
+        buffer.clear()
+
+
+_shared_writer: Optional[BufferedLogWriter] = None
+_shared_writer_lock = threading.Lock()
+
+def get_log_writer() -> BufferedLogWriter:
+    """Returns the process-wide writer behind log(), starting it on first use."""
+    global _shared_writer
+    if _shared_writer is None:
+        with _shared_writer_lock:
+            if _shared_writer is None:
+                writer = BufferedLogWriter(maxsize=LOG_QUEUE_MAXSIZE).start()
+                atexit.register(writer.close)
+                _shared_writer = writer
+    return _shared_writer
+
+def log(message: str) -> None:
+    """Drop-in for print(message, flush=True) from worker threads; the line is written by the shared writer thread."""
+    get_log_writer().write(message + '\n')
@@ -1,16 +1,43 @@
 import requests
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
 from typing import Optional, Dict, Any
 
 # Disable SSL certificate verification warnings
 from urllib3.exceptions import InsecureRequestWarning
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
+# Connections kept alive per host; sized for the default 50 scraper threads plus headroom
+POOL_SIZE = 100
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide session shared by all HTTP scrapers, so keep-alive
+    connections and TLS sessions are reused instead of re-handshaking on every request.
+    Cookies are never stored, keeping each request as stateless as a bare requests.get.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
 def get_with_retry(url: str, headers: Optional[Dict[str, str]] = None, timeout: int = 15, verbose: bool = False, **kwargs) -> requests.Response:
-    response = requests.get(url, headers=headers, timeout=timeout, verify=False, **kwargs)
+    response = get_session().get(url, headers=headers, timeout=timeout, verify=False, **kwargs)
     response.raise_for_status()
     return response
 
 def post_with_retry(url: str, data: Optional[Any] = None, headers: Optional[Dict[str, str]] = None, timeout: int = 15, verbose: bool = False, **kwargs) -> requests.Response:
-    response = requests.post(url, data=data, headers=headers, timeout=timeout, verify=False, **kwargs)
+    response = get_session().post(url, data=data, headers=headers, timeout=timeout, verify=False, **kwargs)
     response.raise_for_status()
     return response
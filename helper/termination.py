@@ -23,7 +23,8 @@ class TerminationHandler:
     """
 
     def __init__(self):
-        self._terminating = False
+        # Set once termination is requested; waiters wake immediately instead of polling is_terminating
+        self.terminate_event = threading.Event()
         self._lock = threading.Lock()
         self._callbacks: Set[Callable] = set()
         self._original_handlers: dict = {}
@@ -33,14 +34,13 @@ class TerminationHandler:
     @property
     def is_terminating(self) -> bool:
         """Check if termination has been requested."""
-        with self._lock:
-            return self._terminating
+        return self.terminate_event.is_set()
 
     def request_termination(self, signum=None, frame=None):
         """Request graceful termination. Called by signal handlers."""
         with self._lock:
             self._kill_counter += 1
-            if self._terminating:
+            if self.terminate_event.is_set():
                 remaining = 3 - self._kill_counter
                 if remaining <= 0:
                     print(f"[CRITICAL] Forced termination requested ({self._kill_counter}/3). Exiting immediately.")
@@ -49,7 +49,7 @@ class TerminationHandler:
                 else:
                     print(f"[INFO] Termination in progress. Press Ctrl+C {remaining} more times to force quit.")
                 return
-            self._terminating = True
+            self.terminate_event.set()
 
         signal_name = signal.Signals(signum).name if signum else "manual"
         print(f"[INTERRUPTED] Termination signal received ({signal_name}). Cleaning up... (Press Ctrl+C 2 more times to force kill)")
@@ -140,6 +140,11 @@ def should_terminate() -> bool:
     return get_termination_handler().is_terminating
 
 
+def wait_for_termination(timeout: Optional[float] = None) -> bool:
+    """Sleeps up to `timeout` seconds, returning True as soon as termination is requested."""
+    return get_termination_handler().terminate_event.wait(timeout)
+
+
 def request_termination(signum=None, frame=None):
     """Convenience function to request termination."""
     get_termination_handler().request_termination(signum, frame)
@@ -4,6 +4,7 @@ import fasteners
 import re
 import time
 from contextlib import suppress
+from typing import Callable
 from seleniumbase import config as sb_config
 from seleniumbase.fixtures import constants
 from seleniumbase.fixtures import js_utils
@@ -398,6 +399,8 @@ def _uc_gui_click_captcha(
     retry=False,
     blind=False,
     ctype=None,
+    callable_after_page_reload: Callable=None,
+    verbose: bool=False
 ):
     driver = sb.driver
     cdp_mode_on_at_start = __is_cdp_swap_needed(driver)
@@ -671,8 +674,20 @@ def _uc_gui_click_captcha(
             sb_config._saved_cf_x_y = (x, y)
             if not __is_cdp_swap_needed(driver):
                 if driver.is_element_present(".footer .clearfix .ray-id"):
-                    print("driver.uc_open_with_disconnect(driver.get_current_url(), 3.8) would've executed")
-                    # driver.uc_open_with_disconnect(driver.get_current_url(), 3.8)
+                    if verbose: print("driver.uc_open_with_disconnect(driver.get_current_url(), 3.8)")
+                    driver.uc_open_with_disconnect(driver.get_current_url(), 3.8)
+
+                    # --- The fix for spys.one starts here (callable_after_page_reload) ---
+                    # After a reload we lose the POST payload, so we need to send the payload again, before we click the captcha (otherwise turnstile doesn't show up)
+                    if verbose: print("callable_after_page_reload() starts now")
+                    if callable_after_page_reload:
+                        if verbose: print("[DEBUG] Turnstile: Re-applying action after captcha solver reloaded page.")
+                        callable_after_page_reload()
+                    if verbose: print("callable_after_page_reload() ends now")
+
+                    # We need to wait for turnstile to reload and become ready again
+                    sb.sleep(6)
+
                 else:
                     driver.disconnect()
             with suppress(Exception):
@@ -723,15 +738,13 @@ def _uc_gui_click_captcha(
                     driver.switch_to.parent_frame(checkbox_success)
                     return
             if blind:
-                print("driver.uc_open_with_disconnect(driver.get_current_url(), 3.8)")
-                # driver.uc_open_with_disconnect(driver.get_current_url(), 3.8)
+                driver.uc_open_with_disconnect(driver.get_current_url(), 3.8)
                 if __is_cdp_swap_needed(driver) and _on_a_captcha_page(driver):
                     _uc_gui_click_x_y(driver, x, y, timeframe=0.32)
                 else:
                     time.sleep(0.1)
             else:
-                print("driver.uc_open_with_reconnect(driver.get_current_url(), 3.8)")
-                # driver.uc_open_with_reconnect(driver.get_current_url(), 3.8)
+                driver.uc_open_with_reconnect(driver.get_current_url(), 3.8)
                 if _on_a_captcha_page(driver):
                     driver.disconnect()
                     _uc_gui_click_x_y(driver, x, y, timeframe=0.32)
@@ -739,12 +752,18 @@ def _uc_gui_click_captcha(
             driver.reconnect(reconnect_time)
 
 
-def uc_gui_click_captcha(sb: BaseCase, frame="iframe", retry=False, blind=False):
-    """Public wrapper for the internal _uc_gui_click_captcha function."""
+def uc_gui_click_captcha(sb: BaseCase, frame="iframe", retry=False, blind=False, callable_after_page_reload: Callable=None, verbose: bool=False):
+    """
+    Public wrapper for the internal _uc_gui_click_captcha function.
+    callable_after_page_reload is run after the solver reloads the page, for sites
+    whose challenge only reappears once the original request is repeated.
+    """
     _uc_gui_click_captcha(
         sb,
         frame=frame,
         retry=retry,
         blind=blind,
         ctype=None,
+        callable_after_page_reload=callable_after_page_reload,
+        verbose=verbose,
     )
\ No newline at end of file
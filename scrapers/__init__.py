@@ -4,7 +4,7 @@ Scrapers package for ProxyGather.
 This package contains various scrapers for different proxy sources.
 """
 
-from .proxy_scraper import scrape_proxies, extract_proxies_from_content
+from .proxy_scraper import scrape_proxies, extract_proxies_from_content, proxy_sort_key
 from .proxyscrape_api_fetcher import fetch_from_api
 from .geonode_scraper import scrape_from_geonode_api
 from .proxydb_scraper import scrape_all_from_proxydb
@@ -24,6 +24,7 @@ from .source_discoverer import discover_urls_from_file, convert_to_jsdelivr_url
 __all__ = [
     'scrape_proxies',
     'extract_proxies_from_content',
+    'proxy_sort_key',
     'fetch_from_api',
     'scrape_from_geonode_api',
     'scrape_all_from_proxydb',
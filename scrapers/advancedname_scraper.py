@@ -86,5 +86,5 @@ def scrape_from_advancedname(verbose: bool = False) -> List[str]:
     if verbose:
         print(f"[INFO] Advanced.name: Finished. Found {len(all_proxies)} unique proxies.", flush=True)
 
-    return sorted(list(all_proxies))
+    return sorted(all_proxies)
 
@@ -101,4 +101,4 @@ def scrape_checkerproxy_archive(verbose: bool = False) -> List[str]:
     if verbose:
         print(f"[INFO] CheckerProxy: Finished. Processed {len(all_proxies)} unique proxies.", flush=True)
 
-    return sorted(list(all_proxies))
+    return sorted(all_proxies)
@@ -69,7 +69,7 @@ def scrape_from_fineproxy(verbose: bool = False) -> List[str]:
         if not match:
             if verbose:
                 print("[WARN] FineProxy: Could not find 'nonce' token in HTML. Skipping API scrape.", flush=True)
-            return sorted(list(all_proxies))
+            return sorted(all_proxies)
         
         nonce = match.group(1)
         if verbose:
@@ -112,4 +112,4 @@ def scrape_from_fineproxy(verbose: bool = False) -> List[str]:
     if verbose:
         print(f"[INFO] FineProxy: Finished. Found {len(all_proxies)} unique proxies.", flush=True)
 
-    return sorted(list(all_proxies))
\ No newline at end of file
+    return sorted(all_proxies)
\ No newline at end of file
@@ -95,4 +95,4 @@ def scrape_from_geonode_api(verbose: bool = False, compliant_mode: bool = True)
         except Exception:
             break # Stop on any network-related error
 
-    return sorted(list(all_proxies))
+    return sorted(all_proxies)
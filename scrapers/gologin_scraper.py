@@ -1,10 +1,10 @@
-﻿import json
-import re
+﻿import re
 import ssl
 import time
 import urllib.request
 from typing import List
 from helper.request_utils import get_with_retry
+from helper.json_utils import json_loads
 
 # URL to fetch the initial page and find the auth token
 GOLOGIN_URL = "https://gologin.com/free-proxy/"
@@ -102,7 +102,7 @@ def scrape_from_gologin_api(verbose: bool = False) -> List[str]:
         
         # Use urllib with custom SSL context to handle connection issues
         response_text = fetch_with_ssl_adapter(url=GEOXY_API_URL, headers=api_headers, timeout=30, verbose=verbose)
-        proxy_data = json.loads(response_text)
+        proxy_data = json_loads(response_text)
         
     except ValueError as e: # Catches JSON decoding errors
         raise Exception(f"Failed to decode JSON from Geoxy API response: {e}") from e
@@ -125,5 +125,5 @@ def scrape_from_gologin_api(verbose: bool = False) -> List[str]:
     if verbose:
         print(f"[INFO] Geoxy API: Finished. Found {len(all_proxies)} unique proxies.", flush=True)
 
-    return sorted(list(all_proxies))
+    return sorted(all_proxies)
 
@@ -1,7 +1,9 @@
 ﻿import re
 import requests
 import time
-from typing import List, Dict
+from hashlib import blake2b
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 import urllib3
 
 # Suppress InsecureRequestWarning
@@ -19,46 +21,63 @@ HEADERS = {
 JS_FILE_REGEX = re.compile(r'<input type="hidden" name="pr" value="([^"]+)">')
 PROXY_ROW_REGEX = re.compile(r'value="(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})\|([a-z0-9]+)"')
 PACKER_REGEX = re.compile(r"\}\('(.+?)',(\d+),(\d+),'([^']+)'\.split\('\|'\)")
+# Every word in the packed payload is a candidate token; the packer only ever emits \w characters for them
+PACKER_TOKEN_REGEX = re.compile(r'\b\w+\b')
+BASE62_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# Unpacked port maps kept per process, keyed by a digest of the packed script rather than the script itself
+PORT_MAP_CACHE_SIZE = 16
+_port_map_cache: Dict[bytes, Dict[str, str]] = {}
 
 # Updated Regex to handle potential backslashes before quotes in the raw string
 PORT_MAP_REGEX = re.compile(r"\$\(\\?['\"]\.(.*?)\\?['\"]\)\.html\((\d+)\)")
 
-def _base_encode(n: int) -> str:
+@lru_cache(maxsize=8)
+def _packer_keys(count: int, radix: int) -> Tuple[str, ...]:
     """
-    Mimics the base-62 encoding used in the JS packer.
+    Mimics the base-N key encoding used in the JS packer for indexes 0..count-1.
+    Each key extends an already built shorter one by its last digit, so no index is encoded from scratch.
     """
-    digits = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
-    if n == 0: 
-        return digits[0]
-    
-    result = ""
-    while n > 0:
-        val = n % 62
-        result = digits[val] + result
-        n = n // 62
-    return result
+    keys = list(BASE62_DIGITS[:min(count, radix)])
+    for i in range(radix, count):
+        keys.append(keys[i // radix] + BASE62_DIGITS[i % radix])
+    return tuple(keys)
 
 def _decode_packer(payload: str, radix: int, count: int, keywords: List[str]) -> str:
     """
     Unpacks the Dean Edwards packed JavaScript code.
     """
-    unpacked = payload
-    # Iterate backwards to avoid replacing substrings of larger tokens
-    for i in range(count - 1, -1, -1):
-        token = _base_encode(i)
-        
-        # Determine replacement
-        if i < len(keywords) and keywords[i]:
-            replacement = keywords[i]
-        else:
-            # If keyword is empty/missing, the token maps to itself
-            continue
-            
-        # Use regex with word boundaries to replace exact token matches
-        pattern = r'\b' + re.escape(token) + r'\b'
-        unpacked = re.sub(pattern, replacement, unpacked)
-            
-    return unpacked
+    # Tokens with an empty/missing keyword map to themselves, so they are left out of the table
+    # The packer supports radixes up to 62; anything else is treated as the common base 62
+    if not 2 <= radix <= 62: radix = 62
+    table = {key: keyword for key, keyword in zip(_packer_keys(count, radix), keywords) if keyword}
+    # One pass over the payload, looking each whole-word token up, instead of a full re.sub per keyword
+    return PACKER_TOKEN_REGEX.sub(lambda m: table.get(m.group(0), m.group(0)), payload)
+
+def _resolve_port_map(js_content: str) -> Optional[Dict[str, str]]:
+    """
+    Returns the port class -> port mapping from the packed JS, or None if it can't be parsed.
+    An unchanged script is served from the cache without unpacking it again.
+    """
+    digest = blake2b(js_content.encode('utf-8'), digest_size=8).digest()
+    mappings = _port_map_cache.get(digest)
+    if mappings is not None: return mappings
+
+    pm = PACKER_REGEX.search(js_content)
+    if not pm: return None
+
+    payload = pm.group(1)
+    radix = int(pm.group(2))
+    count = int(pm.group(3))
+    keywords = pm.group(4).split('|')
+
+    unpacked_js = _decode_packer(payload, radix, count, keywords)
+    mappings = dict(PORT_MAP_REGEX.findall(unpacked_js))
+
+    # Evict the oldest entry; dicts keep insertion order
+    if len(_port_map_cache) >= PORT_MAP_CACHE_SIZE: del _port_map_cache[next(iter(_port_map_cache))]
+    _port_map_cache[digest] = mappings
+    return mappings
 
 def _get_port_map(html_content: str, session: requests.Session, verbose: bool) -> Dict[str, str]:
     match = JS_FILE_REGEX.search(html_content)
@@ -73,21 +92,11 @@ def _get_port_map(html_content: str, session: requests.Session, verbose: bool) -
         if verbose: print(f"[INFO] PremProxy: Fetching port map from {js_url}...", flush=True)
         resp = session.get(js_url, timeout=15, verify=False)
         resp.raise_for_status()
-        js_content = resp.text
         
-        pm = PACKER_REGEX.search(js_content)
-        if not pm:
+        mappings = _resolve_port_map(resp.text)
+        if mappings is None:
             if verbose: print("[ERROR] PremProxy: Could not parse packed JS.", flush=True)
             return {}
-        
-        payload = pm.group(1)
-        radix = int(pm.group(2))
-        count = int(pm.group(3))
-        keywords = pm.group(4).split('|')
-        
-        unpacked_js = _decode_packer(payload, radix, count, keywords)
-        
-        mappings = dict(PORT_MAP_REGEX.findall(unpacked_js))
         if verbose: print(f"[INFO] PremProxy: Extracted {len(mappings)} port mappings.", flush=True)
         return mappings
         
@@ -178,5 +187,5 @@ def scrape_from_premproxy(verbose: bool = False) -> List[str]:
     if verbose:
         print(f"[INFO] PremProxy: Finished. Found {len(all_proxies)} unique proxies.", flush=True)
 
-    return sorted(list(all_proxies))
+    return sorted(all_proxies)
 
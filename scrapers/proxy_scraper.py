@@ -8,28 +8,35 @@ from urllib.parse import urlparse, urljoin
 from urllib.robotparser import RobotFileParser
 from collections import defaultdict
 import threading
-from helper.request_utils import get_with_retry, post_with_retry
-from helper.termination import should_terminate
+from contextlib import nullcontext
+from helper.request_utils import get_session, get_with_retry, post_with_retry
+from helper.termination import should_terminate, wait_for_termination
+from helper.log_writer import log
+from helper.json_utils import json_loads, JSONDecodeError
+
+try:
+    import re2
+except ImportError:
+    re2 = None
 
 # Changed from a set to a list to enforce a prioritized order.
 # Patterns are ordered from most specific/reliable to most generic/broad.
+# Each pattern must capture exactly two groups, the IP and the port.
 PATTERNS = [
     # --- High Priority: Very specific and low risk of false positives ---
 
     # A very selective regex for ProxyDB
     r'<td>\s*<a[^>]*>(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})</a>\s*</td>\s*<td>[\s\S]*?<a[^>]*>(\d{2,5})</a>',
 
-    # 1. Matches `IP:PORT` inside quotes, common in JS/JSON.
-    r'["\'](\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}):(\d{2,5})["\']',
-    
+    # 1. (dropped) `IP:PORT` inside quotes, common in JS/JSON; pattern 7 already finds every such match.
+
     # 2. MODIFIED: Robustly matches IP and Port in table rows, even with non-adjacent columns and newlines.
     #    This now uses [\s\S]*? to match across newlines and correctly parse formatted HTML tables.
     r'<tr[^>]*>[\s\S]*?<td>\s*(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})\s*</td>[\s\S]*?<td>\s*(\d+)\s*</td>',
     
     # 3. Matches IP and Port in adjacent table cells, allowing for whitespace.
     r'<td>\s*(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})\s*</td>\s*<td>\s*(\d+)\s*</td>',
-    # 4. A simpler version for adjacent table cells.
-    r'<td>(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})<\/td>\s*<td>(\d+)<\/td>',
+    # 4. (dropped) A simpler version for adjacent table cells; pattern 3 already finds every such match.
     # 5. Matches IP and Port separated by non-breaking spaces.
     r'(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})  (\d+)',
 
@@ -53,6 +60,21 @@ PATTERNS = [
     #     This avoids matching numbers inside HTML attributes like class="pp14".
     r'(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})[\s<>]+(\d{2,5})',
 ]
+def _compile_pattern(pattern: str):
+    """
+    Compiles with RE2 when it is installed; its linear-time matching avoids the
+    backtracking the lazy table patterns do on large pages. Falls back to re per pattern.
+    """
+    if re2 is not None:
+        try: return re2.compile(pattern)
+        except re2.error: pass
+    return re.compile(pattern)
+
+# Compiled once at import so extraction never goes through the re module's pattern cache
+COMPILED_PATTERNS = [_compile_pattern(pattern) for pattern in PATTERNS]
+# Every pattern needs a dotted quad, so pages without one skip the regex passes entirely
+IP_PRESENT_REGEX = re.compile(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}')
+DATA_CONFIG_REGEX = re.compile(r'data-config="(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}:\d{1,5})"')
 
 DEFAULT_HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3',
@@ -84,25 +106,38 @@ class RobotsTxtChecker:
     def __init__(self):
         self.cache = {}
         self.lock = threading.Lock()
+        self.domain_locks = defaultdict(threading.Lock)
 
     def is_allowed(self, url: str, user_agent: str = '*') -> bool:
         """Check if the URL is allowed by robots.txt."""
         parsed = urlparse(url)
         domain = f"{parsed.scheme}://{parsed.netloc}"
 
-        with self.lock:
+        # Only requests for the same domain wait on its robots.txt fetch
+        with self.lock: domain_lock = self.domain_locks[domain]
+        with domain_lock:
             if domain not in self.cache:
-                rp = RobotFileParser()
-                try:
-                    rp.set_url(urljoin(domain, '/robots.txt'))
-                    rp.read()
-                    self.cache[domain] = rp
-                except Exception:
-                    self.cache[domain] = None
+                self.cache[domain] = self._fetch(domain)
         rp = self.cache[domain]
         if rp is None: return True
         return rp.can_fetch(user_agent, url)
 
+    @staticmethod
+    def _fetch(domain: str) -> Optional[RobotFileParser]:
+        """
+        Reads robots.txt over the shared keep-alive session, mirroring RobotFileParser.read():
+        401/403 disallow everything, other 4xx allow everything. Returns None if it cannot be read.
+        """
+        rp = RobotFileParser(urljoin(domain, '/robots.txt'))
+        try:
+            response = get_session().get(rp.url, headers=DEFAULT_HEADERS, timeout=15, verify=False)
+            if response.status_code in (401, 403): rp.disallow_all = True
+            elif 400 <= response.status_code < 500: rp.allow_all = True
+            elif response.status_code < 400: rp.parse(response.content.decode('utf-8').splitlines())
+        except (requests.RequestException, UnicodeDecodeError):
+            return None
+        return rp
+
 def _recursive_json_search_and_extract(data: Any, proxies_found: Set[str]) -> None:
     if isinstance(data, dict):
         for key in ['address', 'proxy', 'addr', 'ip_port']:
@@ -129,48 +164,61 @@ def _recursive_json_search_and_extract(data: Any, proxies_found: Set[str]) -> No
             elif isinstance(item, (dict, list)):
                 _recursive_json_search_and_extract(item, proxies_found)
 
-def extract_proxies_from_content(content: str, verbose: bool = False) -> set:
+def extract_proxies_from_content(content: str, verbose: bool = False, known: Optional[set] = None) -> set:
+    """
+    Returns every proxy found in the content, leaving out any already in `known`.
+    """
     proxies_found = set()
     
     # 1. Try JSON parsing
     try:
-        json_data = json.loads(content)
+        json_data = json_loads(content)
         _recursive_json_search_and_extract(json_data, proxies_found)
-        if proxies_found and verbose: print("[DEBUG]  ... Found proxies via smart JSON parsing.", flush=True)
-    except (json.JSONDecodeError, TypeError): pass
+        if proxies_found and verbose: log("[DEBUG]  ... Found proxies via smart JSON parsing.")
+    except (ValueError, TypeError): pass
     
     # 2. Try data-config attributes (common in some proxy lists)
-    data_config_pattern = r'data-config="(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}:\d{1,5})"'
-    matches = re.findall(data_config_pattern, content)
+    matches = DATA_CONFIG_REGEX.findall(content)
     if matches:
         proxies_found.update(matches)
-        if verbose: print("[DEBUG]  ... Found proxies via 'data-config' attribute parsing.", flush=True)
+        if verbose: log("[DEBUG]  ... Found proxies via 'data-config' attribute parsing.")
 
     # 3. Always try Regex fallbacks (Aggressive extraction)
     # We do NOT check 'if not proxies_found' here anymore, ensuring we catch everything.
     regex_found = set()
-    for pattern in PATTERNS:
-        try:
-            matches = re.findall(pattern, content)
-            for match in matches:
-                if isinstance(match, tuple) and len(match) >= 2:
-                    regex_found.add(f'{match[0]}:{match[1]}')
-                elif isinstance(match, str) and ":" in match:
-                    regex_found.add(match)
-        except re.error: continue
+    patterns = COMPILED_PATTERNS if IP_PRESENT_REGEX.search(content) else ()
+    for pattern in patterns:
+        # Every pattern captures exactly (ip, port), so each match joins into a proxy without a Python-level loop
+        regex_found.update(map(':'.join, pattern.findall(content)))
     
     if regex_found:
         proxies_found.update(regex_found)
-        if verbose and regex_found: print("[DEBUG]  ... Found proxies via general regex fallback.", flush=True)
+        if verbose and regex_found: log("[DEBUG]  ... Found proxies via general regex fallback.")
 
+    if known: proxies_found.difference_update(known)
     return proxies_found
 
+def proxy_sort_key(proxy: str) -> Tuple[int, Union[int, str]]:
+    """
+    Sort key that orders "ip:port" strings numerically by address, then port, packed
+    into one int. Anything that is not a valid dotted IPv4 proxy sorts after, by its text.
+    """
+    ip, _, port = proxy.rpartition(':')
+    try:
+        a, b, c, d = octets = [int(octet) for octet in ip.split('.')]
+        port = int(port)
+    except ValueError:
+        return 1, proxy
+    # The extraction regexes accept octets up to 999, which would spill into the neighbouring slot
+    if max(octets) > 255 or min(octets) < 0 or not 0 <= port <= 65535: return 1, proxy
+    return 0, a << 48 | b << 40 | c << 32 | d << 24 | port
+
 def _fetch_and_extract_single(url: str, payload: Union[Dict, None], headers: Union[Dict, None], verbose: bool, rate_limiter: DomainRateLimiter = None, robots_checker: RobotsTxtChecker = None) -> Tuple[set, bool]:
     merged_headers = DEFAULT_HEADERS.copy()
     if headers: merged_headers.update(headers)
 
     if robots_checker and not robots_checker.is_allowed(url, merged_headers.get('User-Agent', '*')):
-        if verbose: print(f"[INFO] Skipping {url} - blocked by robots.txt", flush=True)
+        if verbose: log(f"[INFO] Skipping {url} - blocked by robots.txt")
         return set(), False
 
     if rate_limiter:
@@ -185,18 +233,18 @@ def _fetch_and_extract_single(url: str, payload: Union[Dict, None], headers: Uni
         return extract_proxies_from_content(response.text, verbose=verbose), True
     except requests.exceptions.HTTPError as e:
         if e.response and e.response.status_code in [403, 429, 503]:
-            if verbose: print(f"[RETRY] HTTP {e.response.status_code} for {url} (will retry)", flush=True)
+            if verbose: log(f"[RETRY] HTTP {e.response.status_code} for {url} (will retry)")
             return set(), False
-        if verbose: print(f"[ERROR] HTTP {e.response.status_code if e.response else 'error'} for {url}", flush=True)
+        if verbose: log(f"[ERROR] HTTP {e.response.status_code if e.response else 'error'} for {url}")
         return set(), True
     except requests.exceptions.RequestException as e:
         # Check for fatal errors to avoid futile retries
         error_str = str(e).lower()
         fatal_indicators = ["name resolution failure", "name service not known", "getaddrinfo failed"]
         if any(indicator in error_str for indicator in fatal_indicators):
-             if verbose: print(f"[ERROR] Fatal connection error for {url}: {e} (skipping retries)", flush=True)
+             if verbose: log(f"[ERROR] Fatal connection error for {url}: {e} (skipping retries)")
              return set(), True
-        if verbose: print(f"[RETRY] Request failed for {url}: {e} (will retry)", flush=True)
+        if verbose: log(f"[RETRY] Request failed for {url}: {e} (will retry)")
         return set(), False
 
 def _scrape_paginated_url(
@@ -215,11 +263,11 @@ def _scrape_paginated_url(
     # Determine which placeholder format is used
     page_placeholder = "[page]" if "[page]" in base_url or (base_payload and "[page]" in json.dumps(base_payload)) else "{page}"
 
-    if verbose: print(f"\n[INFO] General Scraper: Starting pagination for {base_url}", flush=True)
+    if verbose: log(f"\n[INFO] General Scraper: Starting pagination for {base_url}")
 
     while True:
         if should_terminate():
-            if verbose: print(f"[INFO] General Scraper: Termination requested, stopping pagination for {base_url}", flush=True)
+            if verbose: log(f"[INFO] General Scraper: Termination requested, stopping pagination for {base_url}")
             break
 
         current_url = base_url.replace(page_placeholder, str(page_num))
@@ -227,9 +275,9 @@ def _scrape_paginated_url(
         if base_payload:
             payload_str = json.dumps(base_payload)
             payload_str = payload_str.replace(page_placeholder, str(page_num))
-            current_payload = json.loads(payload_str)
+            current_payload = json_loads(payload_str)
 
-        if verbose: print(f"[INFO]   ... Scraping page {page_num} ({current_url})", flush=True)
+        if verbose: log(f"[INFO]   ... Scraping page {page_num} ({current_url})")
 
         newly_scraped, success = _fetch_and_extract_single(current_url, current_payload, base_headers, verbose, rate_limiter, robots_checker)
 
@@ -239,35 +287,57 @@ def _scrape_paginated_url(
                 try:
                     callback(current_url, newly_scraped)
                 except Exception as e:
-                    if verbose: print(f"[WARN] Callback failed for {current_url}: {e}", flush=True)
+                    if verbose: log(f"[WARN] Callback failed for {current_url}: {e}")
 
             initial_count = len(proxies)
             proxies.update(newly_scraped)
 
             if len(proxies) == initial_count:
-                if verbose: print("[INFO]   ... No new unique proxies found. Ending pagination.", flush=True)
+                if verbose: log("[INFO]   ... No new unique proxies found. Ending pagination.")
                 break
         else:
             # If we failed (success=False) we might want to retry/continue, but if we succeeded with 0 results (success=True), we stop.
             # In paginated logic, if we get 0 proxies, we usually assume end of list.
-            if verbose: print(f"[INFO]   ... No proxies found on page {page_num}. Ending pagination.", flush=True)
+            if verbose: log(f"[INFO]   ... No proxies found on page {page_num}. Ending pagination.")
             break
 
         page_num += 1
-        time.sleep(PAGINATED_RATELIMIT_DELAY)
+        # Woken early by Ctrl+C, so the termination check above runs without waiting out the delay
+        wait_for_termination(PAGINATED_RATELIMIT_DELAY)
 
     return proxies, found_any
 
+def _interleave_by_domain(targets: List[Tuple[str, Union[Dict, None], Union[Dict, None]]]) -> List[Tuple[str, Union[Dict, None], Union[Dict, None]]]:
+    """
+    Reorders targets round-robin across domains. Requests to one domain are spaced by the
+    rate limiter, so a run of same-domain URLs would park pool threads in its wait while
+    URLs for idle domains sit in the queue.
+    """
+    by_domain = defaultdict(list)
+    for target in targets: by_domain[urlparse(target[0]).netloc].append(target)
+    queues = list(by_domain.values())
+    interleaved = []
+    for i in range(max(map(len, queues), default=0)):
+        interleaved.extend(queue[i] for queue in queues if i < len(queue))
+    return interleaved
+
+def _executor_scope(executor: Optional[ThreadPoolExecutor], max_workers: int):
+    # A caller-owned executor must outlive this call, so only private pools are shut down on exit
+    return nullcontext(executor) if executor is not None else ThreadPoolExecutor(max_workers=max_workers)
+
 def scrape_proxies(
     scrape_targets: List[Tuple[str, Union[Dict, None], Union[Dict, None]]],
     verbose: bool = False,
     max_workers: int = 10,
     respect_robots_txt: bool = False,
-    callback: Optional[Callable[[str, Set[str]], None]] = None
+    callback: Optional[Callable[[str, Set[str]], None]] = None,
+    executor: Optional[ThreadPoolExecutor] = None
 ) -> Tuple[List[str], List[str]]:
     """
     Scrapes proxies concurrently with domain-based rate limiting.
     Returns both the proxies and a list of successful source URLs.
+    If `executor` is given, requests run on it (shared with other callers and left
+    open); otherwise a private pool of up to `max_workers` threads is used.
     """
     all_proxies = set()
     successful_urls = set()
@@ -284,21 +354,23 @@ def scrape_proxies(
             paginated_targets.append((url, payload, headers))
         else:
             single_req_targets.append((url, payload, headers))
+    single_req_targets = _interleave_by_domain(single_req_targets)
+    paginated_targets = _interleave_by_domain(paginated_targets)
 
     if single_req_targets:
         retry_attempts = {(url, json.dumps(payload) if payload else None, json.dumps(headers) if headers else None): 0
                           for url, payload, headers in single_req_targets}
         max_retries = 3
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        with _executor_scope(executor, min(max_workers, len(single_req_targets))) as pool:
             future_to_target = {
-                executor.submit(_fetch_and_extract_single, url, payload, headers, verbose, rate_limiter, robots_checker): (url, payload, headers)
+                pool.submit(_fetch_and_extract_single, url, payload, headers, verbose, rate_limiter, robots_checker): (url, payload, headers)
                 for url, payload, headers in single_req_targets
             }
 
             while future_to_target:
                 if should_terminate():
-                    if verbose: print("[INFO] General Scraper: Termination requested, stopping single-request scraping", flush=True)
+                    if verbose: log("[INFO] General Scraper: Termination requested, stopping single-request scraping")
                     break
 
                 for future in as_completed(list(future_to_target.keys())):
@@ -312,48 +384,48 @@ def scrape_proxies(
 
                         if success:
                             if proxies_from_url:
-                                if verbose: print(f"[INFO] General Scraper: Found {len(proxies_from_url)} proxies on {url}", flush=True)
+                                if verbose: log(f"[INFO] General Scraper: Found {len(proxies_from_url)} proxies on {url}")
                                 if callback:
                                     try:
                                         callback(url, proxies_from_url)
                                     except Exception as e:
-                                        if verbose: print(f"[WARN] Callback failed for {url}: {e}", flush=True)
+                                        if verbose: log(f"[WARN] Callback failed for {url}: {e}")
                                 all_proxies.update(proxies_from_url)
                                 successful_urls.add(url)
                         else:
                             retry_attempts[key] += 1
                             if retry_attempts[key] < max_retries:
-                                if verbose: print(f"[INFO] Retrying {url} (attempt {retry_attempts[key] + 1}/{max_retries})", flush=True)
-                                new_future = executor.submit(_fetch_and_extract_single, url, payload, headers, verbose, rate_limiter, robots_checker)
+                                if verbose: log(f"[INFO] Retrying {url} (attempt {retry_attempts[key] + 1}/{max_retries})")
+                                new_future = pool.submit(_fetch_and_extract_single, url, payload, headers, verbose, rate_limiter, robots_checker)
                                 future_to_target[new_future] = (url, payload, headers)
                             else:
-                                if verbose: print(f"[ERROR] Max retries reached for {url}", flush=True)
+                                if verbose: log(f"[ERROR] Max retries reached for {url}")
                     except Exception as exc:
-                        if verbose: print(f"[ERROR] An exception occurred while processing {url}: {exc}", flush=True)
+                        if verbose: log(f"[ERROR] An exception occurred while processing {url}: {exc}")
 
     if paginated_targets:
         if should_terminate():
-            if verbose: print("[INFO] General Scraper: Termination requested, skipping paginated URL scraping", flush=True)
+            if verbose: log("[INFO] General Scraper: Termination requested, skipping paginated URL scraping")
         else:
-            print(f"[INFO] General Scraper: Found {len(paginated_targets)} paginated URLs. Scraping concurrently...", flush=True)
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            log(f"[INFO] General Scraper: Found {len(paginated_targets)} paginated URLs. Scraping concurrently...")
+            with _executor_scope(executor, min(max_workers, len(paginated_targets))) as pool:
                 future_to_url = {
-                    executor.submit(_scrape_paginated_url, base_url, base_payload, base_headers, verbose, rate_limiter, robots_checker, callback): base_url
+                    pool.submit(_scrape_paginated_url, base_url, base_payload, base_headers, verbose, rate_limiter, robots_checker, callback): base_url
                     for base_url, base_payload, base_headers in paginated_targets
                 }
                 for future in as_completed(future_to_url):
                     if should_terminate():
-                        if verbose: print("[INFO] General Scraper: Termination requested, stopping paginated URL scraping", flush=True)
+                        if verbose: log("[INFO] General Scraper: Termination requested, stopping paginated URL scraping")
                         break
                     base_url = future_to_url[future]
                     try:
                         proxies_from_url, found_any = future.result()
                         if found_any:
-                            if verbose: print(f"[INFO] General Scraper: Found {len(proxies_from_url)} total proxies from {base_url}", flush=True)
+                            if verbose: log(f"[INFO] General Scraper: Found {len(proxies_from_url)} total proxies from {base_url}")
                             all_proxies.update(proxies_from_url)
                             successful_urls.add(base_url)
                     except Exception as exc:
-                        if verbose: print(f"[ERROR] An exception occurred while processing {base_url}: {exc}", flush=True)
+                        if verbose: log(f"[ERROR] An exception occurred while processing {base_url}: {exc}")
 
-    return sorted(list(all_proxies)), sorted(list(successful_urls))
+    return sorted(all_proxies, key=proxy_sort_key), sorted(successful_urls)
 
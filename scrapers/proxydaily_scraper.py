@@ -2,6 +2,7 @@
 import requests
 from typing import List
 from urllib.robotparser import RobotFileParser
+from helper.request_utils import get_with_retry
 
 # Disable SSL certificate verification warnings
 from urllib3.exceptions import InsecureRequestWarning
@@ -82,8 +83,7 @@ def scrape_from_proxydaily(verbose: bool = False, compliant_mode: bool = False)
             print(f"[INFO] Proxy-Daily: Fetching proxies starting at index {start}...", flush=True)
 
         try:
-            response = requests.get(API_URL, headers=HEADERS, params=params, timeout=20, verify=False)
-            response.raise_for_status()
+            response = get_with_retry(url=API_URL, headers=HEADERS, timeout=20, verbose=verbose, params=params)
             data = response.json()
             
             # Update total records on first run
@@ -134,5 +134,5 @@ def scrape_from_proxydaily(verbose: bool = False, compliant_mode: bool = False)
     if verbose:
         print(f"[INFO] Proxy-Daily: Finished. Found {len(all_proxies)} unique proxies.", flush=True)
 
-    return sorted(list(all_proxies))
+    return sorted(all_proxies)
 
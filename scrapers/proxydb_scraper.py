@@ -68,5 +68,5 @@ def scrape_all_from_proxydb(verbose: bool = False, compliant_mode: bool = False)
         offset += 30
         page_num += 1
         
-    return sorted(list(all_found_proxies))
+    return sorted(all_found_proxies)
 
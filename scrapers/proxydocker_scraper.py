@@ -15,6 +15,9 @@ API_URL = "https://www.proxydocker.com/en/api/proxylist/"
 # Matches: <meta name="_token" content= "9ctEFMbiQ3lUIztwzcGVkqUiyxqob3gWx9FVopTpt70">
 TOKEN_REGEX = re.compile(r'<meta name="_token" content=\s*"([^"]+)">')
 
+# Fallback for API responses that aren't JSON lists
+PROXY_TEXT_REGEX = re.compile(r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}:\d+\b')
+
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36',
     'Accept': 'application/json, text/javascript, */*; q=0.01',
@@ -98,7 +101,7 @@ def scrape_from_proxydocker(verbose: bool = False) -> List[str]:
                 if not proxies_on_page:
                     # Regex for IP:PORT
                     page_text = api_response.text
-                    proxies_on_page = re.findall(r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}:\d+\b', page_text)
+                    proxies_on_page = PROXY_TEXT_REGEX.findall(page_text)
 
                 if not proxies_on_page:
                     if verbose:
@@ -145,5 +148,5 @@ def scrape_from_proxydocker(verbose: bool = False) -> List[str]:
     if verbose:
         print(f"[INFO] ProxyDocker: Finished. Found {len(all_proxies)} unique proxies.", flush=True)
 
-    return sorted(list(all_proxies))
+    return sorted(all_proxies)
 
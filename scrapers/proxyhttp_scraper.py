@@ -1,5 +1,5 @@
 ﻿import re
-from typing import List, Dict
+from typing import List, Dict, Set, Tuple
 import time
 import random
 from helper.request_utils import get_with_retry
@@ -24,33 +24,57 @@ def _deobfuscate_variables(script_content: str) -> Dict[str, int]:
     XOR variable assignments.
     """
     variables = {}
-    assignments = VAR_ASSIGN_REGEX.findall(script_content)
+    # Each expression is split and its literals converted once; later passes only retry the lookups
+    assignments = [
+        (name, [int(part) if part.isdigit() else part for part in value_str.split('^')])
+        for name, value_str in VAR_ASSIGN_REGEX.findall(script_content)
+    ]
 
     unsolved_count = -1
     while len(assignments) != unsolved_count:
         unsolved_count = len(assignments)
         remaining_assignments = []
 
-        for name, value_str in assignments:
-            parts = value_str.split('^')
-            try:
-                current_val = 0
-                for part in parts:
-                    if part.isdigit():
-                        current_val ^= int(part)
-                    elif part in variables:
-                        current_val ^= variables[part]
-                    else:
-                        raise ValueError("Dependency not solved")
-
+        for name, terms in assignments:
+            current_val = 0
+            for term in terms:
+                if isinstance(term, int):
+                    current_val ^= term
+                elif term in variables:
+                    current_val ^= variables[term]
+                else:
+                    # Dependency not solved yet
+                    remaining_assignments.append((name, terms))
+                    break
+            else:
                 variables[name] = current_val
-            except (ValueError, TypeError):
-                remaining_assignments.append((name, value_str))
 
         assignments = remaining_assignments
 
     return variables
 
+def _decode_rows(proxy_rows: List[Tuple[str, str]], var_map: Dict[str, int], verbose: bool, location: str = "") -> Set[str]:
+    """
+    Resolves each row's XOR port expression against the page's variables.
+    Rows sharing a port share the expression, so each distinct one is evaluated once per page.
+    """
+    proxies = set()
+    add = proxies.add
+    ports: Dict[str, str] = {}
+    for ip, port_script in proxy_rows:
+        port = ports.get(port_script)
+        if port is None:
+            try:
+                value = 0
+                for part in port_script.split('^'):
+                    value ^= int(part) if part.isdigit() else var_map[part]
+                port = ports[port_script] = str(value)
+            except Exception as e:
+                if verbose: print(f"[WARN] ProxyHttp.net: Could not calculate port for IP {ip}{location}: {e}", flush=True)
+                continue
+        add(ip + ':' + port)
+    return proxies
+
 def scrape_from_proxyhttp(verbose: bool = False) -> List[str]:
     """
     Scrapes and de-obfuscates proxies from the main page and all paginated
@@ -70,23 +94,14 @@ def scrape_from_proxyhttp(verbose: bool = False) -> List[str]:
         script_match = VAR_SCRIPT_REGEX.search(html)
         if script_match:
             var_map = _deobfuscate_variables(script_match.group(1))
-            proxy_rows = PROXY_ROW_REGEX.findall(html)
-            for ip, port_script in proxy_rows:
-                try:
-                    port_parts = port_script.split('^')
-                    port = 0
-                    for part in port_parts:
-                        port ^= int(part) if part.isdigit() else var_map[part]
-                    all_found_proxies.add(f"{ip}:{port}")
-                except Exception as e:
-                    if verbose: print(f"[WARN] ProxyHttp.net: Could not calculate port for IP {ip} on main page: {e}", flush=True)
+            all_found_proxies.update(_decode_rows(PROXY_ROW_REGEX.findall(html), var_map, verbose, " on main page"))
             if verbose: print(f"[INFO]   ... Found {len(all_found_proxies)} proxies on the main page.", flush=True)
         else:
             if verbose: print("[WARN] ProxyHttp.net: No variable script found on main page.", flush=True)
 
     except Exception:
         if verbose: print(f"[ERROR] ProxyHttp.net: Could not access main page after retries. Stopping.", flush=True)
-        return sorted(list(all_found_proxies))
+        return sorted(all_found_proxies)
 
     # --- Step 2: Scrape the paginated anonymous list ---
     page_num = 1
@@ -126,18 +141,7 @@ def scrape_from_proxyhttp(verbose: bool = False) -> List[str]:
                 print(f"[INFO] ProxyHttp.net: No proxies found on page {page_num}. Assuming end of list.", flush=True)
             break
 
-        newly_found_on_page = set()
-        for ip, port_script in proxy_rows:
-            try:
-                port_parts = port_script.split('^')
-                port = 0
-                for part in port_parts:
-                    port ^= int(part) if part.isdigit() else var_map[part]
-                newly_found_on_page.add(f"{ip}:{port}")
-            except Exception as e:
-                if verbose:
-                    print(f"[WARN] ProxyHttp.net: Could not calculate port for IP {ip}: {e}", flush=True)
-                continue
+        newly_found_on_page = _decode_rows(proxy_rows, var_map, verbose)
 
         if verbose:
             print(f"[INFO]   ... Found {len(newly_found_on_page)} proxies on this page. Total unique: {len(all_found_proxies | newly_found_on_page)}", flush=True)
@@ -157,5 +161,5 @@ def scrape_from_proxyhttp(verbose: bool = False) -> List[str]:
     if verbose:
         print(f"[INFO] ProxyHttp.net: Finished. Found a total of {len(all_found_proxies)} unique proxies.", flush=True)
 
-    return sorted(list(all_found_proxies))
+    return sorted(all_found_proxies)
 
@@ -96,5 +96,5 @@ def scrape_from_proxylistorg(verbose: bool = False) -> List[str]:
     if verbose:
         print(f"[INFO] ProxyList.org: Finished. Found a total of {len(all_proxies)} unique proxies.", flush=True)
 
-    return sorted(list(all_proxies))
+    return sorted(all_proxies)
 
@@ -1,7 +1,8 @@
 ﻿import re
-import time
 import requests
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Set
+from helper.request_utils import get_session
 
 # Disable SSL certificate verification warnings
 from urllib3.exceptions import InsecureRequestWarning
@@ -19,6 +20,9 @@ HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36',
 }
 
+# All lists live on the same host, so at most this many are fetched at once to stay polite
+MAX_CONCURRENT_PAGES = 2
+
 # Regex to find the row with proxy ID
 ROW_REGEX = re.compile(r'<tr data-proxy-id="\d+">([\s\S]*?)</tr>')
 
@@ -28,6 +32,12 @@ SCRIPT_REGEX = re.compile(r'<script>document\.write\((.*)\)</script>')
 # Regex to find the port. It's either a number or inside an anchor tag.
 PORT_REGEX = re.compile(r'(?:<a[^>]*>)?\s*(\d+)\s*(?:</a>)?')
 
+# Regex to split a row into its cells
+CELL_REGEX = re.compile(r'<td[^>]*>([\s\S]*?)</td>')
+
+# Only plain arithmetic is ever passed to eval
+MATH_EXPR_REGEX = re.compile(r'^[\d\s+\-*/().]+$')
+
 class JSStringParser:
     """
     A lightweight recursive parser for the specific subset of JavaScript 
@@ -101,7 +111,7 @@ class JSStringParser:
                 self.pos += 1
             math_expr = self.expr[start:self.pos]
             try:
-                if not re.match(r'^[\d\s+\-*/().]+$', math_expr): return 0
+                if not MATH_EXPR_REGEX.match(math_expr): return 0
                 return int(eval(math_expr, {"__builtins__":{}}))
             except Exception:
                 return 0
@@ -138,73 +148,76 @@ def _deobfuscate_ip(js_code: str) -> str:
     except Exception:
         return ""
 
+def _scrape_list(url: str, verbose: bool) -> Set[str]:
+    """Fetches one ProxyNova list page and decodes every proxy row on it."""
+    proxies = set()
+    if verbose:
+        print(f"[INFO] ProxyNova: Scraping {url}...", flush=True)
+
+    try:
+        response = get_session().get(url, headers=HEADERS, timeout=20, verify=False)
+        if response.status_code != 200:
+            if verbose: print(f"[WARN] ProxyNova: HTTP {response.status_code} for {url}", flush=True)
+            return proxies
+
+        html_content = response.text
+
+        # Find all proxy rows
+        rows = ROW_REGEX.findall(html_content)
+        if not rows:
+            if verbose: print(f"[INFO]   ... No proxy rows found on {url}", flush=True)
+            return proxies
+
+        for row_html in rows:
+            # 1. Extract IP script
+            script_match = SCRIPT_REGEX.search(row_html)
+            if not script_match:
+                continue
+
+            js_code = script_match.group(1)
+            ip = _deobfuscate_ip(js_code)
+
+            # 2. Extract Port
+            cells = CELL_REGEX.findall(row_html)
+            if len(cells) < 2: continue
+
+            port_html = cells[1]
+            port_match = PORT_REGEX.search(port_html)
+            if not port_match:
+                continue
+
+            port = port_match.group(1)
+
+            if ip and port and ip.count('.') == 3:
+                proxies.add(f"{ip}:{port}")
+
+    except Exception as e:
+        if verbose:
+            print(f"[ERROR] ProxyNova: Failed to scrape {url}: {e}", flush=True)
+
+    return proxies
+
 def scrape_from_proxynova(verbose: bool = False) -> List[str]:
     """
     Scrapes proxies from proxynova.com by parsing the HTML and executing 
     the JavaScript string obfuscation logic in Python.
+    The lists are independent pages, so they are fetched a few at a time.
     """
     if verbose:
         print("\n[RUNNING] 'ProxyNova' scraper has started.", flush=True)
 
     all_proxies = set()
-    
-    for url in URLS:
-        if verbose:
-            print(f"[INFO] ProxyNova: Scraping {url}...", flush=True)
-            
-        try:
-            response = requests.get(url, headers=HEADERS, timeout=20, verify=False)
-            if response.status_code != 200:
-                if verbose: print(f"[WARN] ProxyNova: HTTP {response.status_code} for {url}", flush=True)
-                continue
-                
-            html_content = response.text
-            
-            # Find all proxy rows
-            rows = ROW_REGEX.findall(html_content)
-            if not rows:
-                if verbose: print(f"[INFO]   ... No proxy rows found on {url}", flush=True)
-                continue
-                
-            new_proxies_count = 0
-            for row_html in rows:
-                # 1. Extract IP script
-                script_match = SCRIPT_REGEX.search(row_html)
-                if not script_match:
-                    continue
-                
-                js_code = script_match.group(1)
-                ip = _deobfuscate_ip(js_code)
-                
-                # 2. Extract Port
-                cells = re.findall(r'<td[^>]*>([\s\S]*?)</td>', row_html)
-                if len(cells) < 2: continue
-
-                port_html = cells[1]
-                port_match = PORT_REGEX.search(port_html)
-                if not port_match:
-                    continue
-
-                port = port_match.group(1)
-                
-                if ip and port:
-                    if ip.count('.') == 3:
-                        proxy = f"{ip}:{port}"
-                        if proxy not in all_proxies:
-                            all_proxies.add(proxy)
-                            new_proxies_count += 1
-            
-            if verbose:
-                print(f"[INFO]   ... Found {new_proxies_count} proxies. Total unique: {len(all_proxies)}", flush=True)
-            
-            time.sleep(1.5)
-
-        except Exception as e:
-            if verbose:
-                print(f"[ERROR] ProxyNova: Failed to scrape {url}: {e}", flush=True)
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PAGES, thread_name_prefix='ProxyNova') as executor:
+        futures = {executor.submit(_scrape_list, url, verbose): url for url in URLS}
+        for future in as_completed(futures):
+            proxies = future.result()
+            new_proxies_count = len(proxies - all_proxies)
+            all_proxies.update(proxies)
+            if verbose and proxies:
+                print(f"[INFO]   ... Found {new_proxies_count} new proxies on {futures[future]}. Total unique: {len(all_proxies)}", flush=True)
 
     if verbose:
         print(f"[INFO] ProxyNova: Finished. Found {len(all_proxies)} unique proxies.", flush=True)
 
-    return sorted(list(all_proxies))
-
+    return sorted(all_proxies)
@@ -125,5 +125,5 @@ def scrape_from_proxyservers(verbose: bool = False) -> List[str]:
     if verbose:
         print(f"[INFO] ProxyServers.pro: Finished. Found {len(all_proxies)} unique proxies.", flush=True)
 
-    return sorted(list(all_proxies))
+    return sorted(all_proxies)
 
@@ -1,9 +1,10 @@
 ﻿import re
-import json
 from typing import List, Set, Any
 from urllib.parse import urljoin, urlparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from helper.request_utils import get_with_retry
+from helper.log_writer import log
+from helper.json_utils import json_loads, JSONDecodeError
 
 # Matches href attributes to extract potential links from HTML
 HREF_REGEX = re.compile(r'href=["\']([^"\']+)["\']', re.IGNORECASE)
@@ -41,9 +42,7 @@ def is_url_allowed(url: str) -> bool:
         if ':' in netloc:
             netloc = netloc.split(':')[0]
             
-        # Remove 'www.' prefix
-        if netloc.startswith('www.'):
-            netloc = netloc[4:]
+        netloc = netloc.removeprefix('www.')
         
         if netloc in IGNORED_DOMAINS:
             return False
@@ -130,45 +129,53 @@ def _fetch_and_extract_links(url: str, verbose: bool) -> Set[str]:
     links = set()
     try:
         if verbose:
-            print(f"[INFO] Discovery: Fetching source {url}...", flush=True)
+            log(f"[INFO] Discovery: Fetching source {url}...")
 
         # Use a shorter timeout for discovery to avoid hanging
         response = get_with_retry(url, timeout=15, verbose=verbose)
 
         # Try parsing as JSON first
         try:
-            json_data = json.loads(response.text)
+            json_data = json_loads(response.content)
             if verbose:
-                print(f"[INFO] Discovery: Response is JSON, extracting URLs from arrays.", flush=True)
+                log(f"[INFO] Discovery: Response is JSON, extracting URLs from arrays.")
             links.update(_extract_urls_from_json(json_data))
-        except (json.JSONDecodeError, TypeError):
+        except (ValueError, TypeError):
             # Not JSON, proceed with other extraction methods
             pass
 
+        # requests decodes the body again on every .text access, so do it once
+        text = response.text
+
         # Extract hrefs from HTML content
-        found_hrefs = HREF_REGEX.findall(response.text)
+        found_hrefs = HREF_REGEX.findall(text)
         for href in found_hrefs:
             full_url = urljoin(url, href)
             if full_url.startswith(('http://', 'https://')):
                 links.add(full_url)
 
         # Parse line by line for plain text URL lists
-        for line in response.text.splitlines():
+        for line in text.splitlines():
             extracted_url = _extract_url_from_line(line)
             if extracted_url and extracted_url.startswith(('http://', 'https://')):
                 links.add(extracted_url)
 
         # Fallback: regex to catch any URLs we might have missed
         if not links or verbose:
-            fallback_urls = URL_REGEX.findall(response.text)
-            for fallback_url in fallback_urls:
+            checked = set()
+            for match in URL_REGEX.finditer(text):
+                fallback_url = match.group()
+                # Only the first occurrence of each URL decides, as before
+                if fallback_url in checked: continue
+                checked.add(fallback_url)
                 # Filter out lines that contain [js]
-                if '[js]' not in response.text[response.text.find(fallback_url)-20:response.text.find(fallback_url)+20] if fallback_url in response.text else True:
+                start = match.start()
+                if '[js]' not in text[start-20:start+20]:
                     links.add(fallback_url)
 
     except Exception as e:
         if verbose:
-            print(f"[WARN] Discovery failed for {url}: {e}", flush=True)
+            log(f"[WARN] Discovery failed for {url}: {e}")
     return links
 
 def discover_urls_from_file(filename: str, verbose: bool = False, threads: int = 20) -> List[str]:
@@ -187,12 +194,12 @@ def discover_urls_from_file(filename: str, verbose: bool = False, threads: int =
         return []
 
     if verbose:
-        print(f"[INFO] Discovery: Processing {len(target_urls)} seed URLs from '{filename}'...", flush=True)
+        log(f"[INFO] Discovery: Processing {len(target_urls)} seed URLs from '{filename}'...")
 
     discovered = set()
 
     # Use threading to speed up the fetching of seed pages
-    with ThreadPoolExecutor(max_workers=threads) as executor:
+    with ThreadPoolExecutor(max_workers=min(threads, len(target_urls))) as executor:
         future_to_url = {executor.submit(_fetch_and_extract_links, url, verbose): url for url in target_urls}
 
         for future in as_completed(future_to_url):
@@ -214,7 +221,7 @@ def discover_urls_from_file(filename: str, verbose: bool = False, threads: int =
             pass
 
     if verbose:
-        print(f"[INFO] Discovery: Found {len(converted_urls)} potential target URLs (after filtering).", flush=True)
+        log(f"[INFO] Discovery: Found {len(converted_urls)} potential target URLs (after filtering).")
 
-    return sorted(list(converted_urls))
+    return sorted(converted_urls)
 
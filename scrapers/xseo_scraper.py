@@ -103,10 +103,8 @@ def scrape_from_xseo(verbose: bool = True) -> List[str]:
                     print(f"[INFO] XSEO.in: No JavaScript port obfuscation found on {url}. Checking for plain text.", flush=True)
 
             # --- Pass 2: Handle Plain Text Proxies (the fallback method) ---
-            plain_text_matches = PLAIN_TEXT_PROXY_REGEX.findall(html_content)
-            plain_text_found = set()
-            for ip, port in plain_text_matches:
-                plain_text_found.add(f"{ip}:{port}")
+            # The regex captures exactly (ip, port), so each match joins into a proxy without formatting it
+            plain_text_found = set(map(':'.join, PLAIN_TEXT_PROXY_REGEX.findall(html_content)))
             
             if verbose and plain_text_found:
                 # To avoid confusion, only report newly found plain-text proxies
@@ -132,5 +130,5 @@ def scrape_from_xseo(verbose: bool = True) -> List[str]:
     if verbose:
         print(f"[INFO] XSEO.in: Finished. Found {len(all_proxies)} unique proxies from {len(URLS_TO_SCRAPE)} URLs.", flush=True)
 
-    return sorted(list(all_proxies))
+    return sorted(all_proxies)
 
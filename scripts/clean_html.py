@@ -7,8 +7,14 @@ reducing its size while keeping the core DOM structure intact.
 
 import argparse
 import os
+import re
 from html.parser import HTMLParser
 
+# Compiled once; the URL filter runs for every text node in the document
+URL_REGEX = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+WWW_REGEX = re.compile(r'www\.[^\s<>"{}|\\^`\[\]]+')
+WHITESPACE_REGEX = re.compile(r'\s+')
+
 class HTMLCleaner(HTMLParser):
     """
     A custom HTML parser to remove unwanted tags, attributes, and content.
@@ -137,16 +143,12 @@ class HTMLCleaner(HTMLParser):
     
     def _filter_urls_from_text(self, text):
         """Remove URLs from text content."""
-        import re
-        # Pattern to match URLs
-        url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
         # Replace URLs with empty string
-        text = re.sub(url_pattern, '', text)
+        text = URL_REGEX.sub('', text)
         # Also remove www. patterns
-        www_pattern = r'www\.[^\s<>"{}|\\^`\[\]]+'
-        text = re.sub(www_pattern, '', text)
+        text = WWW_REGEX.sub('', text)
         # Clean up multiple spaces that might result
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = WHITESPACE_REGEX.sub(' ', text).strip()
         return text
 
     def get_cleaned_html(self):